@@ -1,3 +1,4 @@
+import shutil
 from pathlib import Path
 
 import stroll
@@ -39,6 +40,18 @@ def find(s=""):
     return (w for w in WAVE_FILES if w.name in READABLE and s in w.name)
 
 
+def copy(s=""):
+    """Copy the first test file matching `s` into the current directory"""
+    source = next(find(s))
+    shutil.copy(source, source.name)
+    return Path(source.name)
+
+
+def no_warnings(msg):
+    """A warn callback that fails the test"""
+    raise AssertionError(msg)
+
+
 def canonical(filename):
     target_file = EXPECTED_ROOT / filename.relative_to(DATA_ROOT)
     target_file.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,48 @@
+import asyncio
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+import wavemap
+
+from . import files
+
+NAMES = "M1F1-int16-", "M1F1-float32-", "6_Channel", "Tom"
+
+
+async def _read(name, **kwargs):
+    return [b async for b in wavemap.aiter_blocks(name, **kwargs)]
+
+
+class TestAio(unittest.TestCase):
+    def test_aiter_blocks(self):
+        names = [next(files.find(n)) for n in NAMES]
+
+        async def main():
+            limit = asyncio.Semaphore(2)
+            jobs = [_read(n, frames=10000, limit=limit, prefetch=3) for n in names]
+            return await asyncio.gather(*jobs)
+
+        for name, parts in zip(names, asyncio.run(main())):
+            wm = wavemap(name)
+            assert all(len(p) <= 10000 for p in parts)
+            assert not any(np.shares_memory(p, wm) for p in parts)
+            assert_array_equal(np.concatenate(parts), wm)
+
+    def test_break(self):
+        name = next(files.find("6_Channel"))
+
+        async def main():
+            blocks = wavemap.aiter_blocks(name, frames=1000, prefetch=0)
+            async for block in blocks:
+                break
+            await blocks.aclose()
+            return block
+
+        assert_array_equal(asyncio.run(main()), wavemap(name)[:1000])
+
+    def test_always_2d(self):
+        name = next(files.find("Tom"))
+        parts = asyncio.run(_read(name, always_2d=True))
+        assert parts[0].shape == (len(wavemap(name)), 1)
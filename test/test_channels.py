@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+
+import wavemap
+from wavemap import blocks, channels
+
+from . import files
+
+
+class TestChannels(unittest.TestCase):
+    def test_layout(self):
+        wm = wavemap(next(files.find("6_Channel")))
+        assert wm.channel_mask == 0x3F
+        assert wm.channel_layout == ("FL", "FR", "FC", "LFE", "BL", "BR")
+
+        assert wavemap(next(files.find("drmapan"))).channel_layout == (
+            "FL",
+            "FR",
+            "BL",
+            "BR",
+        )
+        kick = wavemap(next(files.find("Kick")))
+        assert kick.channel_mask is None
+        assert kick.channel_layout == ("FL", "FR")
+
+        assert channels.layout(0x3, 3) == ("FL", "FR", None)
+        assert channels.layout(None, 3) == (None, None, None)
+
+    def test_views(self):
+        wm = wavemap(next(files.find("6_Channel")))
+        view = wm[10:]
+        assert view.channel_mask == 0x3F
+        assert view.channel_layout == wm.channel_layout
+        assert view.chunks == wm.chunks
+
+        copy = wm[10:] * 2
+        assert copy.channel_mask is None
+        assert copy.chunks is None
+
+    def test_select(self):
+        wm = wavemap(next(files.find("6_Channel")))
+        cm = wavemap.select_channels(wm, ["BR", 0])
+        assert cm.shape == (len(wm), 2) and cm.dtype == wm.dtype
+        assert cm.sample_rate == wm.sample_rate
+
+        expected = wm[:, [5, 0]]
+        assert_array_equal(cm[1000:3000], expected[1000:3000])
+        parts = list(blocks.blocks(cm, 100000))
+        assert [len(p) for p in parts] == [100000, 100000, 57411]
+        assert all(p.flags.c_contiguous for p in parts)
+        assert_array_equal(np.concatenate(parts), expected)
+
+        with self.assertRaises(ValueError):
+            wavemap.select_channels(wm, ["SL"])
+        with self.assertRaises(IndexError):
+            wavemap.select_channels(wm, [6])
+
+    def test_downmix(self):
+        wm = wavemap(next(files.find("6_Channel")))
+        x = wavemap.convert(wm[:5000], "float32")
+        a = 1 / np.sqrt(2)
+        left = x[:, 0] + a * x[:, 2] + a * x[:, 4]
+        right = x[:, 1] + a * x[:, 2] + a * x[:, 5]
+
+        dm = wavemap.downmix(wm)
+        assert dm.shape == (len(wm), 2) and dm.dtype == np.float32
+        assert_allclose(dm[:5000], np.stack([left, right], 1), atol=1e-6)
+
+        mono = wavemap.downmix(wm, np.ones((6, 1)))
+        assert_allclose(mono[:5000, 0], x.sum(1), atol=1e-6)
+
+        with self.assertRaises(ValueError):
+            wavemap.downmix(wm, np.ones((2, 2)))
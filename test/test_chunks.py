@@ -0,0 +1,86 @@
+import unittest
+from pathlib import Path
+
+import numpy as np
+import tdir
+from numpy.testing import assert_array_equal
+
+import wavemap
+from wavemap import chunks
+
+from . import files
+
+
+class TestChunks(unittest.TestCase):
+    def test_read_chunks(self):
+        wm = wavemap(next(files.find("int16-")))
+        tags = [c.tag for c in wm.chunks]
+        assert tags == [b"fmt ", b"data", b"afsp", b"LIST"]
+
+        data = chunks.find(wm.chunks, b"data")
+        assert data.data == wm.offset
+        assert data.size == wm.nbytes
+
+    @tdir
+    def test_write_in_place(self):
+        filename = files.copy("int16-")
+        before = np.array(wavemap(filename))
+        size = Path(filename).stat().st_size
+
+        chunks.write_info(filename, {"INAM": "A name", "ICMT": "Comment"})
+        assert chunks.read_info(filename) == {"INAM": "A name", "ICMT": "Comment"}
+        assert Path(filename).stat().st_size < size
+
+        chunks.write_info(filename, {"INAM": "Long name" * 100})
+        assert chunks.read_info(filename) == {"INAM": "Long name" * 100}
+        assert_array_equal(wavemap(filename, warn=files.no_warnings), before)
+
+    @tdir
+    def test_relocate(self):
+        wavemap.copy_to(wavemap(next(files.find("int16"))), "test.wav", roffset=0)
+        before = Path("test.wav").read_bytes()
+
+        chunks.write_chunk("test.wav", b"bext", b"x" * 101)
+        chunks.write_chunk("test.wav", b"cue ", b"y" * 4)
+        assert chunks.read_chunk("test.wav", b"bext") == b"x" * 101
+
+        after = Path("test.wav").read_bytes()
+        assert after[8 : len(before)] == before[8:]
+
+        # bext is not at the end, so it moves and leaves JUNK behind
+        chunks.write_chunk("test.wav", b"bext", b"z" * 200)
+        wm = wavemap("test.wav", warn=files.no_warnings)
+        tags = [c.tag for c in wm.chunks]
+        assert tags == [b"fmt ", b"data", b"JUNK", b"cue ", b"bext"]
+
+        # A smaller chunk fits into the JUNK
+        chunks.write_chunk("test.wav", b"LIST", b"INFO")
+        wm = wavemap("test.wav", warn=files.no_warnings)
+        tags = [c.tag for c in wm.chunks]
+        assert tags == [b"fmt ", b"data", b"LIST", b"JUNK", b"cue ", b"bext"]
+
+        assert chunks.delete_chunk("test.wav", b"cue ")
+        assert not chunks.delete_chunk("test.wav", b"cue ")
+        assert chunks.read_chunk("test.wav", b"cue ") is None
+
+        with self.assertRaises(ValueError):
+            chunks.write_chunk("test.wav", b"data", b"")
+
+    @tdir
+    def test_odd_sizes(self):
+        source = next(files.find("Tom"))
+        wm = wavemap(source)
+        end = chunks.find(wm.chunks, b"fmt ").padded_end
+        data = source.read_bytes()
+
+        for tag in b"odd ", b"o\1d ":
+            body = data[12:end] + chunks.chunk_header(tag, 3) + b"abc\0" + data[end:]
+            size = (len(body) + 4).to_bytes(4, "little")
+            Path("test.wav").write_bytes(b"RIFF" + size + b"WAVE" + body)
+
+            warnings = []
+            odd = wavemap("test.wav", warn=warnings.append)
+            assert [c.tag for c in odd.chunks] == [b"fmt ", tag, b"data"]
+            assert_array_equal(odd, wm)
+
+        assert warnings == ["Dubious tag b'o\\x01d '"]
@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+import wavemap
+from wavemap import blocks
+
+from . import files
+
+
+class TestConcat(unittest.TestCase):
+    def test_concat(self):
+        names = [next(files.find(s)) for s in ("int16-", "int16WE", "int16-")]
+        maps = [wavemap(n) for n in names]
+        expected = np.concatenate(maps)
+
+        cm = wavemap.ConcatMap(names)
+        assert cm.shape == expected.shape and len(cm) == len(expected)
+        assert cm.sample_rate == maps[0].sample_rate
+        assert_array_equal(cm, expected)
+
+        n = len(maps[0])
+        view = cm[n + 10 : n + 20]
+        assert np.shares_memory(view, cm.maps[1])
+        assert_array_equal(view, expected[n + 10 : n + 20])
+
+        for key in (
+            slice(n - 5, n + 5),
+            slice(None, None, -1000),
+            (slice(n - 5, 2 * n + 5, 3), 1),
+            -1,
+            (n, 0),
+        ):
+            assert_array_equal(cm[key], expected[key])
+
+        assert cm.locate(n) == (1, 0)
+        with self.assertRaises(IndexError):
+            cm.locate(len(cm))
+
+    def test_blocks(self):
+        maps = [wavemap(next(files.find("int16-")))] * 2
+        cm = wavemap.ConcatMap(maps)
+        parts = list(blocks.blocks(cm, 10000))
+        assert [len(p) for p in parts] == [10000] * 4 + [6986]
+        assert [np.shares_memory(p, maps[0]) for p in parts] == [
+            True,
+            True,
+            False,
+            True,
+            True,
+        ]
+        assert_array_equal(np.concatenate(parts), np.concatenate(maps))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            wavemap.ConcatMap([])
+        with self.assertRaises(ValueError):
+            wavemap.ConcatMap([next(files.find("int16-")), next(files.find("int32-"))])
+        with self.assertRaises(ValueError):
+            wavemap.ConcatMap([next(files.find("int16-")), next(files.find("Kick"))])
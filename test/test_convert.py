@@ -1,10 +1,14 @@
+import tracemalloc
 import unittest
 
 import numpy as np
+import tdir
 from numpy.testing import assert_array_equal
 
 import wavemap
 
+from . import files
+
 
 class TestConvert(unittest.TestCase):
     def test_convert(self):
@@ -37,3 +41,96 @@ class TestConvert(unittest.TestCase):
         f64 = conv(u8, "float64")
         assert np.amin(f64) == -1
         assert np.amax(f64) == 1
+
+
+class TestNormalize(unittest.TestCase):
+    @tdir
+    def test_normalize_int(self):
+        wm = wavemap(next(files.find("M1F1-int16-")))
+        x = np.array(wm, "float64")
+        level = max(x.max() / 0x7FFF, x.min() / -0x8000)
+
+        for threads in 1, 3:
+            wavemap.copy_to(wm, "quiet.wav", roffset=0)
+            quiet = wavemap("quiet.wav", "r+", track_dirty=True)
+            assert wavemap.peak(quiet, 1000, threads) == level
+
+            gain = wavemap.normalize(quiet, 1000, threads)
+            assert gain == 1 / level
+            assert list(quiet.dirty) == [(0, len(quiet))]
+
+            scaled = x.astype("float32") * np.float32(gain)
+            expected = np.clip(np.rint(scaled), -0x8000, 0x7FFF)
+            assert_array_equal(quiet, expected)
+            assert wavemap.prevent_clipping(quiet) == 1
+
+    def test_prevent_clipping_float(self):
+        x = np.linspace(-2, 1, 10001, dtype="float32")
+        y = x.copy()
+        assert wavemap.prevent_clipping(y, 1000, 2) == 0.5
+        assert_array_equal(y, x / 2)
+
+        z = np.zeros(10, "float32")
+        assert wavemap.normalize(z) == 1
+        assert not z.any()
+
+    def test_normalize_uint8(self):
+        x = np.array([64, 128, 160], "uint8")
+        assert wavemap.normalize(x) == 2
+        assert_array_equal(x, [0, 128, 192])
+
+
+class TestApplyGain(unittest.TestCase):
+    @tdir
+    def test_divide(self):
+        wm = wavemap(next(files.find("M1F1-int16-")))
+        x = np.array(wm, "float32")
+        wavemap.copy_to(wm, "gain.wav", roffset=0)
+
+        with wavemap("gain.wav", "r+") as gain:
+            gain /= 2
+        assert_array_equal(wavemap("gain.wav"), np.rint(x / 2))
+
+        with wavemap("gain.wav", "r+") as gain:
+            gain *= 5.5
+            gain *= 2.0
+        expected = np.clip(np.rint(np.rint(x / 2) * 5.5) * 2, -0x8000, 0x7FFF)
+        assert_array_equal(wavemap("gain.wav"), expected)
+
+        with wavemap("gain.wav", "r+") as gain:
+            gain *= 4
+        expected = np.clip(expected * 4, -0x8000, 0x7FFF)
+        assert_array_equal(wavemap("gain.wav"), expected)
+        assert (expected == 0x7FFF).any()
+
+    @tdir
+    def test_fortran_order(self):
+        wm = wavemap(next(files.find("M1F1-int16-")))
+        x = np.array(wm, "float32")
+        wavemap.copy_to(wm, "gain.wav", roffset=0)
+
+        gain = wavemap("gain.wav", "r+", order="F")
+        tracemalloc.start()
+        gain *= 0.5
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert peak < 4 * x.nbytes
+        assert_array_equal(gain.T, np.rint(x * 0.5))
+
+    def test_apply_gain(self):
+        x = np.arange(-0x8000, 0x8000, 7, dtype="int16")
+
+        y = wavemap.apply_gain(x.copy(), 3.0, frames=1000, threads=2)
+        assert_array_equal(y, np.clip(3 * x.astype("int32"), -0x8000, 0x7FFF))
+
+        y = wavemap.apply_gain(x.copy(), 0.5, dither="tpdf", frames=1000)
+        assert np.abs(y - x / 2).max() <= 1.5
+        assert (y != np.rint(x / 2)).any()
+
+        f = np.linspace(-1, 1, 101, dtype="float32")
+        assert_array_equal(wavemap.apply_gain(f.copy(), 2), np.clip(2 * f, -1, 1))
+        assert_array_equal(wavemap.apply_gain(f.copy(), 2, clip=False), 2 * f)
+
+        with self.assertRaises(ValueError):
+            wavemap.apply_gain(x, 2, dither="white")
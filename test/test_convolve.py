@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+import tdir
+from numpy.testing import assert_allclose
+
+import wavemap
+from wavemap import Convolver
+
+from . import files
+
+
+def _expected(x, taps):
+    columns = [np.convolve(x[:, i], taps[:, i % taps.shape[1]]) for i in range(2)]
+    return np.stack(columns, axis=1)
+
+
+class TestConvolve(unittest.TestCase):
+    def test_convolver(self):
+        rng = np.random.default_rng(1)
+        x = rng.uniform(-1, 1, (5000, 2))
+        taps = rng.uniform(-1, 1, (300, 2))
+        expected = _expected(x, taps)
+
+        c = Convolver(taps, 2, fft_size=1024)
+        assert c.block_frames == 725
+        parts = [c.process(x[i : i + 999]) for i in range(0, 5000, 999)]
+        y = np.concatenate(parts + [c.flush()])
+        assert_allclose(y, expected, atol=1e-9)
+
+        c = Convolver(taps[:, 0], 2)
+        y = np.concatenate([c.process(x), c.flush()])
+        assert_allclose(y, _expected(x, taps[:, :1]), atol=1e-9)
+
+        with self.assertRaises(ValueError):
+            Convolver(np.ones((10, 3)), 2)
+        with self.assertRaises(ValueError):
+            Convolver(np.ones(10), 2, fft_size=8)
+
+    @tdir
+    def test_convolve(self):
+        wm = wavemap(next(files.find("M1F1-float32-")))
+        taps = np.hanning(1001)[:, None] / 500
+        expected = _expected(np.array(wm, "float64"), taps)
+
+        out = wavemap.convolve(wm, taps, "full.wav", full=True, frames=7000)
+        assert out.shape == (len(wm) + 1000, 2) and out.sample_rate == wm.sample_rate
+        assert_allclose(out, expected, atol=1e-5)
+
+        wavemap.copy_to(wm, "copy.wav", roffset=0)
+        with wavemap("copy.wav", "r+") as copy:
+            assert wavemap.convolve(copy, taps, frames=3000) is copy
+        assert_allclose(wavemap("copy.wav"), out[: len(wm)], atol=1e-6)
+
+        ints = wavemap.convolve(wm, taps, "int.wav", dtype="int16")
+        expected = wavemap.convert(out[: len(wm)], "int16").astype("int32")
+        assert np.abs(ints - expected).max() <= 1
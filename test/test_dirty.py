@@ -0,0 +1,72 @@
+import unittest
+from pathlib import Path
+
+import numpy as np
+import tdir
+
+import wavemap
+from wavemap import blocks
+
+from . import files
+
+
+class TestRanges(unittest.TestCase):
+    def test_add(self):
+        r = wavemap.Ranges([(10, 20), (30, 40)])
+        assert list(r) == [(10, 20), (30, 40)]
+
+        r.add(20, 25)
+        r.add(50, 50)
+        assert r == [(10, 25), (30, 40)]
+
+        r.add(0, 5)
+        r.add(24, 31)
+        assert r == [(0, 5), (10, 40)]
+        assert r.frames == 35
+        assert 4 in r and 5 not in r and 39 in r and 40 not in r
+
+        assert r.shift(-5) == [(-5, 0), (5, 35)]
+        r.add(-10, 100)
+        assert r == [(-10, 100)]
+
+
+class TestDirty(unittest.TestCase):
+    @tdir
+    def test_dirty(self):
+        source = files.copy("int16")
+
+        wm = wavemap(source.name, "r+", track_dirty=True)
+        assert wm.dirty == []
+
+        blocks.write(wm, np.zeros((100, 2), wm.dtype), 1000)
+        view = wm[5000:]
+        blocks.write_blocks(view, [np.ones((10, 2), wm.dtype)] * 3, 10)
+        assert wm.dirty == [(1000, 1100), (5010, 5040)]
+
+        wm.flush_dirty()
+        assert wm.dirty == []
+        assert (wavemap(source.name)[5010:5040] == 1).all()
+
+    @tdir
+    def test_copy_to(self):
+        wm = wavemap(next(files.find("int16")))
+        assert wm.dirty is None
+
+        wm2 = wavemap.copy_to(wm, Path("copy.wav"), track_dirty=True)
+        assert wm2.dirty == [(0, len(wm))]
+
+        fortran = np.zeros((2, 5000), "int16")
+        wm3 = wavemap.copy_to(fortran, "fortran.wav", track_dirty=True)
+        assert wm3.shape == (2, 5000)
+        assert wm3.dirty == [(0, 5000)]
+
+        wm3.dirty.clear()
+        blocks.mark_dirty(wm3, 100)
+        assert wm3.dirty == [(100, 5000)]
+
+    def test_blocks(self):
+        arr = np.arange(10)
+        assert list(blocks.ranges(10, 4)) == [(0, 4), (4, 8), (8, 10)]
+        assert [len(b) for b in blocks.blocks(arr, 3)] == [3, 3, 3, 1]
+        with self.assertRaises(ValueError):
+            list(blocks.ranges(10, 0))
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+import wavemap
+from wavemap import Dither
+
+
+class TestDither(unittest.TestCase):
+    def test_noise(self):
+        for kind in "tpdf", "shaped":
+            d = Dither(kind, seed=23, frames=1000)
+            noise = d.add(np.zeros((2500, 2), "float32"))
+            assert -1 < noise.min() < -0.9 and 0.9 < noise.max() < 1
+            assert abs(noise.mean()) < 0.05
+
+            again = Dither(kind, seed=23, frames=1000)
+            assert_array_equal(noise, again.add(np.zeros((2500, 2), "float32")))
+            assert_array_equal(noise[1000:2000], d.noise(1000, (1000, 2), "float32"))
+
+        shaped = Dither("shaped", seed=5).add(np.zeros(100000))
+        white = Dither("tpdf", seed=5).add(np.zeros(100000))
+        spectrum = np.abs(np.fft.rfft(shaped)) / np.abs(np.fft.rfft(white))
+        assert spectrum[:1000].mean() < 0.1
+        assert spectrum[-1000:].mean() > 1
+
+    def test_convert(self):
+        x = np.linspace(-0.001, 0.001, 20001, dtype="float32")
+        plain = wavemap.convert(x, "int16")
+        dithered = wavemap.convert(x, "int16", dither=Dither(seed=1))
+        assert_array_equal(dithered, wavemap.convert(x, "int16", dither=Dither(seed=1)))
+
+        assert np.abs(dithered - plain.astype("int32")).max() == 1
+        assert len(np.unique(dithered)) > len(np.unique(plain))
+
+        # Dither turns the staircase into noise around the true signal
+        error = wavemap.convert(dithered, "float64") - x
+        assert abs(error.mean()) < 1e-5
+
+    def test_convert_blocks(self):
+        x = np.zeros(3000, "float32")
+        d = Dither(seed=2, frames=1000)
+        whole = wavemap.convert(x, "int16", dither=d)
+        parts = [
+            wavemap.convert(x[b : b + 1500], "int16", dither=d, start=b)
+            for b in (0, 1500)
+        ]
+
+        assert (parts[0] != parts[1]).any()
+        assert_array_equal(np.concatenate(parts)[:1000], whole[:1000])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            Dither("white")
+        with self.assertRaises(ValueError):
+            wavemap.convert(np.zeros(3), "int16", dither="white")
@@ -60,6 +60,26 @@ ARGUMENTS
     If `True`, mono WAVE files are treated the same as any other file
     and are mapped to a two-dimensional matrix with `size=(N, 1)`.
 
+  durability
+    When changes to the `numpy.darray` get written to disk.
+    Must be one of `'none'`, `'async'`, `'periodic'` and `'close'`,
+    or a number of seconds.
+
+    In `'none'`, the default, changes are written when the operating system
+    decides to, or when `flush()` is called.
+
+    In `'async'`, `flush()` returns at once and writes in the background.
+
+    In `'periodic'`, or if a number of seconds is given, changes are also
+    written at that regular interval.
+
+    In `'close'`, changes are also written when `close()` is called, or at
+    the end of a `with` block.
+
+  track_dirty
+    If `True`, the ranges of frames written through wavemap, rather than
+    directly through numpy, are recorded in the `dirty` property.
+
   warn
     Programmers are sloppy so quite a lot of real-world WAVE files have
     recoverable errors in their format.  `warn` is the function used to
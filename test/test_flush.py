@@ -0,0 +1,96 @@
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import tdir
+
+import wavemap
+
+from . import files
+
+
+class TestFlush(unittest.TestCase):
+    @tdir
+    def test_flush_frames(self):
+        filename = files.copy("int16")
+        wm = wavemap(filename, "r+")
+        wm[10000:10010] = 1234
+        wm.flush(frames=(10000, 10010))
+        assert (wavemap(filename)[10000:10010] == 1234).all()
+
+        view = wm[20000:]
+        view[5] = 4321
+        view.flush(frames=(5, 6))
+        assert (wavemap(filename)[20005] == 4321).all()
+
+        wm.flush(frames=(10, 10))
+        wm.flush(frames=(-10, None))
+
+    @tdir
+    def test_flush_frames_fortran(self):
+        filename = files.copy("int16")
+        wm = wavemap(filename, "r+", order="F")
+        assert wm.shape[0] == 2
+        wm[:, 10000:10010] = 1234
+
+        with mock.patch.object(wm._sync, "flush") as flush:
+            wm.flush(frames=(10000, 10010))
+        (begin, size), _ = flush.call_args
+        assert begin <= wm._mmap_position(10000) and size > 0
+        wm.flush(frames=(10000, 10010))
+        assert (wavemap(filename)[10000:10010] == 1234).all()
+
+        with self.assertRaises(ValueError):
+            wm[:, ::-1].flush(frames=(0, 1))
+
+    @tdir
+    def test_fewer_frames_than_channels(self):
+        data = np.arange(12, dtype="int16")
+        header = wavemap.write.header(data.dtype, 6, 2, 8000)
+        Path("short.wav").write_bytes(header + data.tobytes())
+
+        wm = wavemap("short.wav", "r+", track_dirty=True)
+        assert wm.shape == (2, 6) and wm._frame_bytes == 12
+        assert wm._is_frames()
+
+        wm[1] = 7
+        wm[1:].mark_dirty(0, 1)
+        assert wm.dirty == [(1, 2)]
+        wm.flush(frames=(1, 2))
+        assert (wavemap("short.wav")[1] == 7).all()
+
+    @tdir
+    def test_async(self):
+        filename = files.copy("int16")
+        wm = wavemap(filename, "r+", durability="async")
+        assert wm.durability == "async"
+        wm[:100] = 7
+        future = wm.flush()
+        future.result()
+        assert (wavemap(filename)[:100] == 7).all()
+        wm.close()
+
+    @tdir
+    def test_periodic_and_close(self):
+        filename = files.copy("int16")
+        with wavemap(filename, "r+", durability=0.01) as wm:
+            assert wm.durability == "periodic"
+            wm[:100] = 3
+        assert (wavemap(filename)[:100] == 3).all()
+
+        with wavemap.copy_to(wm, "copy.wav", durability="close") as wm2:
+            assert wm2.durability == "close"
+        assert (wavemap("copy.wav")[:100] == 3).all()
+
+    def test_error(self):
+        filename = next(files.find("int16"))
+        with self.assertRaises(ValueError):
+            wavemap(filename, durability="sometimes")
+        with self.assertRaises(ValueError):
+            wavemap(filename, durability=-1)
+
+    def test_not_mapped(self):
+        wm = wavemap(next(files.find("int16")))
+        assert (wm + 1).flush() is None
+        assert wm[0].flush(frames=(0, 1)) is None
@@ -0,0 +1,48 @@
+import os
+import unittest
+
+import tdir
+from numpy.testing import assert_array_equal
+
+import wavemap
+from wavemap import kernel, write
+
+from . import files
+
+
+class TestKernel(unittest.TestCase):
+    @tdir
+    def test_copy_to(self):
+        source = files.copy("int16")
+        wm = wavemap(source.name, "r+")
+        wm[100:200] = 17
+
+        view = wm[50:1050]
+        assert write._can_copy_file(view, write.WriteMap.new_like(view, "a.wav"))
+        assert_array_equal(wavemap.copy_to(view, "a.wav"), view)
+
+        column = wm[:, 1]
+        assert not write._can_copy_file(column, wavemap.new_like(column, "b.wav"))
+        assert_array_equal(wavemap.copy_to(column, "b.wav"), column)
+
+        cow = wavemap(source.name, "c")
+        cow[:10] = 5
+        assert_array_equal(wavemap.copy_to(cow, "c.wav")[:10], cow[:10])
+
+    @tdir
+    def test_fallbacks(self):
+        with open("source", "wb") as fp:
+            fp.write(bytes(range(256)) * 100)
+
+        for copy in kernel._sendfile, kernel._pread_pwrite:
+            src = os.open("source", os.O_RDONLY)
+            dst = os.open("dest", os.O_RDWR | os.O_CREAT)
+            try:
+                copy(src, 10, dst, 5, 1000)
+            finally:
+                os.close(src)
+                os.close(dst)
+
+            with open("dest", "rb") as fp:
+                assert fp.read()[5:] == (bytes(range(256)) * 100)[10:1010]
+            os.remove("dest")
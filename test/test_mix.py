@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+import tdir
+from numpy.testing import assert_allclose, assert_array_equal
+
+import wavemap
+from wavemap import Source
+
+from . import files
+
+
+def _float(name):
+    return wavemap.convert(wavemap(next(files.find(name))), "float32")
+
+
+class TestMix(unittest.TestCase):
+    @tdir
+    def test_mix(self):
+        name = next(files.find("M1F1-int16-"))
+        a = _float("M1F1-int16-")
+        b = _float("M1F1-float32-")
+
+        out = wavemap(
+            "mix.wav", "w", dtype="float32", shape=(len(a) + 100, 2), sample_rate=8000
+        )
+        sources = [Source(name, 0.5), Source(b, 0.25, 100)]
+        gain = wavemap.mix(sources, out, frames=1000, prevent_clipping=False)
+
+        expected = np.zeros(out.shape, "float32")
+        expected[: len(a)] += 0.5 * a
+        expected[100:] += 0.25 * b
+        assert gain == 1
+        assert_allclose(out, expected, atol=1e-6)
+
+        out2 = wavemap(
+            "mix2.wav", "w", dtype="float32", shape=out.shape, sample_rate=8000
+        )
+        wavemap.mix(sources, out2, frames=1000, threads=3, prevent_clipping=False)
+        assert_array_equal(out2, out)
+
+    @tdir
+    def test_pan(self):
+        tom = _float("Tom")
+        out = wavemap(
+            "mix.wav", "w", dtype="float32", shape=(len(tom), 2), sample_rate=44100
+        )
+        wavemap.mix([Source(tom, pan=-1), Source(tom, 0.5, pan=1)], out)
+
+        assert_allclose(out[:, 0], tom, atol=1e-6)
+        assert_allclose(out[:, 1], 0.5 * tom, atol=1e-6)
+
+    @tdir
+    def test_prevent_clipping(self):
+        kick = next(files.find("Kick"))
+        loud = 4 * _float("Kick")
+        out = wavemap(
+            "mix.wav", "w", dtype="int16", shape=loud.shape, sample_rate=44100
+        )
+        gain = wavemap.mix([kick] * 4, out, frames=4096)
+
+        peak = np.abs(loud).max()
+        assert peak > 1 and gain == 1 / peak
+        assert_allclose(wavemap.convert(out, "float32"), loud / peak, atol=1e-4)
+
+    def test_errors(self):
+        out = np.zeros((100, 2), "float32")
+        with self.assertRaises(ValueError):
+            wavemap.mix([np.zeros((10, 4), "float32")], out)
+        with self.assertRaises(ValueError):
+            wavemap.mix([Source(np.zeros((10, 2), "float32"), pan=0)], out)
+        with self.assertRaises(ValueError):
+            wavemap.mix([Source(np.zeros(10, "float32"), offset=-1)], out)
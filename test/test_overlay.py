@@ -0,0 +1,78 @@
+import os
+import unittest
+from pathlib import Path
+
+import numpy as np
+import tdir
+from numpy.testing import assert_array_equal
+
+import wavemap
+
+from . import files
+
+
+class TestOverlay(unittest.TestCase):
+    @tdir
+    def test_commit(self):
+        filename = files.copy("int16")
+        before = Path(filename).read_bytes()
+        expected = np.array(wavemap(filename))
+
+        ov = wavemap.Overlay(filename, block_frames=1000)
+        assert ov.shape == expected.shape and len(ov) == len(expected)
+
+        ov[10:20] = 5
+        ov[2500, 1] = -7
+        ov[-3:] = 9
+        ov[100:90:-2] = 3
+        expected[10:20] = 5
+        expected[2500, 1] = -7
+        expected[-3:] = 9
+        expected[100:90:-2] = 3
+
+        assert_array_equal(ov[:], expected)
+        assert_array_equal(ov[2490:2510, 1], expected[2490:2510, 1])
+        assert ov.modified == [(0, 1000), (2000, 3000), (23000, len(ov))]
+        assert Path(filename).read_bytes() == before
+        ov.close()
+
+        ov = wavemap.Overlay(filename)
+        assert ov.block_frames == 1000
+        assert_array_equal(np.asarray(ov), expected)
+        ov.commit()
+
+        assert not ov.delta.exists()
+        assert_array_equal(wavemap(filename), expected)
+
+    @tdir
+    def test_discard(self):
+        filename = files.copy("int16")
+        before = Path(filename).read_bytes()
+        with wavemap.Overlay(filename, delta="edits") as ov:
+            ov.write(np.ones((5000, 2), "int16"), 7)
+            assert ov.modified == [(0, 8192)]
+            assert (ov[7:5007] == 1).all()
+        ov.discard()
+
+        assert not Path("edits").exists()
+        assert Path(filename).read_bytes() == before
+
+    @tdir
+    def test_stale_delta(self):
+        filename = files.copy("int16")
+        with wavemap.Overlay(filename) as ov:
+            ov[0] = 1
+
+        mtime = os.stat(filename).st_mtime_ns
+        os.utime(filename, ns=(mtime, mtime + 1_000_000_000))
+        with self.assertRaises(ValueError):
+            wavemap.Overlay(filename)
+
+    def test_errors(self):
+        ov = wavemap.Overlay(next(files.find("int16")), delta="none")
+        with self.assertRaises(IndexError):
+            ov.write(np.ones((5, 2), "int16"), len(ov) - 1)
+        with self.assertRaises(TypeError):
+            ov[[1, 2]]
+        with self.assertRaises(ValueError):
+            wavemap.Overlay(next(files.find("int16")), block_frames=0)
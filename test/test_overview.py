@@ -0,0 +1,90 @@
+import itertools
+import os
+import unittest
+
+import numpy as np
+import tdir
+from numpy.testing import assert_allclose, assert_array_equal
+
+import wavemap
+from wavemap import Overview
+from wavemap.sidecar import Sidecar
+
+from . import files
+
+
+def _expected(x, edges):
+    x = np.asarray(x, "float64")
+    parts = [x[b:e] for b, e in itertools.pairwise(edges)]
+    mins = [p.min(0) for p in parts]
+    maxes = [p.max(0) for p in parts]
+    rms = [np.sqrt(np.mean(p * p, 0)) for p in parts]
+    return np.array(mins), np.array(maxes), np.array(rms)
+
+
+class TestOverview(unittest.TestCase):
+    @tdir
+    def test_overview(self):
+        source = files.copy("M1F1-int16-")
+        wm = wavemap(source)
+
+        for threads in 1, 2:
+            ov = Overview(source, decimation=64, threads=threads)
+            sizes = [len(level) for level in ov.levels]
+            assert sizes[:3] == [368, 184, 92] and sizes[-1] == 1
+            top = ov.levels[-1][0]
+            assert_array_equal(top["min"], wm.min(0))
+            assert_array_equal(top["max"], wm.max(0))
+            os.remove(ov.sidecar.path)
+
+        ov = Overview(source, decimation=64)
+        for start, stop, pixels in (0, 23493, 100), (1024, 9216, 4), (100, 400, 20):
+            q = ov.query(start, stop, pixels)
+            assert q.shape == (pixels, 2)
+            edges = np.linspace(start, stop, pixels + 1).astype(int)
+            if (stop - start) / pixels < 64:
+                mins, maxes, rms = _expected(wm, edges)
+            else:
+                k = int(np.log2((stop - start) / pixels / 64))
+                size = 64 << k
+                end = min(-(-stop // size) * size, len(wm))
+                mins, maxes, rms = _expected(wm, [*edges[:-1] // size * size, end])
+            assert_array_equal(q["min"], mins)
+            assert_array_equal(q["max"], maxes)
+            assert_allclose(q["rms"], rms, rtol=1e-5)
+
+        with self.assertRaises(ValueError):
+            ov.query(0, 0, 10)
+        with self.assertRaises(ValueError):
+            Overview(source, decimation=100)
+
+    @tdir
+    def test_unsigned(self):
+        source = files.copy("M1F1-uint8-")
+        wm = wavemap(source)
+        x = np.array(wm, "float64") - 128
+
+        ov = Overview(source, decimation=64)
+        top = ov.levels[-1][0]
+        assert_array_equal(top["min"], wm.min(0))
+        assert_allclose(top["rms"], np.sqrt(np.mean(x * x, 0)), rtol=1e-5)
+        assert_allclose(top["rms"], wavemap.stats(wm)[0].rms, rtol=1e-5)
+
+        q = ov.query(100, 400, 20)
+        _, _, rms = _expected(x, np.linspace(100, 400, 21).astype(int))
+        assert_allclose(q["rms"], rms, rtol=1e-5)
+
+    @tdir
+    def test_sidecar(self):
+        source = files.copy("Tom")
+        mtime = Overview(source).sidecar.path.stat().st_mtime_ns
+        Overview(source)
+        assert Sidecar(source, ".overview", b"WMOV").load() is not None
+        assert Overview(source).sidecar.path.stat().st_mtime_ns == mtime
+
+        os.utime(source, ns=(0, 0))
+        assert Sidecar(source, ".overview", b"WMOV").load() is None
+        assert Sidecar(source, ".overview", b"XXXX").load() is None
+        ov = Overview(source)
+        assert ov.sidecar.load() is not None
+        assert_array_equal(ov.levels[-1][0]["max"], wavemap(source).max())
@@ -0,0 +1,78 @@
+import os
+import unittest
+
+import numpy as np
+import tdir
+from numpy.testing import assert_array_equal
+
+import wavemap
+from wavemap import PlanarCache
+
+from . import files
+
+
+class TestPlanar(unittest.TestCase):
+    @tdir
+    def test_planar(self):
+        source = files.copy("6_Channel")
+        wm = wavemap(source)
+
+        for threads in 1, 4:
+            pc = PlanarCache(source, threads=threads)
+            assert pc.shape == wm.shape and pc.sample_rate == wm.sample_rate
+            for i in range(6):
+                c = pc.channel(i)
+                assert c.flags.c_contiguous and not c.flags.writeable
+                assert_array_equal(c, wm[:, i])
+            os.remove(pc.sidecar.path)
+
+        pc = PlanarCache(source)
+        view = pc[1000:2000, 3]
+        assert np.shares_memory(view, pc.planes)
+        assert_array_equal(view, wm[1000:2000, 3])
+        assert_array_equal(pc[10:20], wm[10:20])
+        assert_array_equal(pc[::-7, 1:3], wm[::-7, 1:3])
+
+        mtime = pc.sidecar.path.stat().st_mtime_ns
+        assert PlanarCache(source).sidecar.path.stat().st_mtime_ns == mtime
+
+        with wavemap(source, "r+") as w:
+            w[0] = 1
+        os.utime(source, ns=(0, 0))
+        assert_array_equal(PlanarCache(source).channel(5)[:2], [1, wm[1, 5]])
+
+    @tdir
+    def test_mono(self):
+        source = files.copy("Tom")
+        assert_array_equal(PlanarCache(source)[:, 0], wavemap(source))
+
+
+class TestWritePlanar(unittest.TestCase):
+    @tdir
+    def test_arrays(self):
+        wm = wavemap(next(files.find("6_Channel")))
+        out = wavemap.write_planar([wm[:, i] for i in range(6)], "a.wav", 44100)
+        assert out.shape == wm.shape and out.dtype == wm.dtype
+        assert_array_equal(out, wm)
+        assert_array_equal(wavemap("a.wav"), wm)
+
+    @tdir
+    def test_iterators(self):
+        x = np.linspace(-1, 1, 10001, dtype="float32")
+
+        def pieces(a, size):
+            for i in range(0, len(a), size):
+                yield a[i : i + size]
+
+        channels = [pieces(x, 333), pieces(-x, 4096), x / 2]
+        out = wavemap.write_planar(channels, "a.wav", 8000, dtype="int16", length=10001)
+        assert out.shape == (10001, 3)
+        expected = np.stack([x, -x, x / 2], axis=1)
+        assert_array_equal(out, wavemap.convert(expected, "int16"))
+
+        with self.assertRaises(ValueError):
+            wavemap.write_planar([pieces(x, 10)], "b.wav", 8000)
+        with self.assertRaises(ValueError):
+            wavemap.write_planar([x, x[:-1]], "b.wav", 8000)
+        with self.assertRaises(ValueError):
+            wavemap.write_planar([x[:-1], x], "b.wav", 8000)
@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+import tdir
+from numpy.testing import assert_allclose, assert_array_equal
+
+import wavemap
+from wavemap import Resampler
+
+from . import files
+
+
+def _sine(frames, rate, frequency=440):
+    t = np.arange(frames) / rate
+    return 0.5 * np.sin(2 * np.pi * frequency * t)
+
+
+class TestResample(unittest.TestCase):
+    def test_resampler(self):
+        x = _sine(10000, 44100)
+        r = Resampler(44100, 48000)
+        y = np.concatenate([r.process(x[:3333]), r.process(x[3333:]), r.flush()])
+        assert y.shape == (r.output_frames(10000), 1) == (10885, 1)
+
+        expected = _sine(len(y), 48000)
+        assert_allclose(y[100:-100, 0], expected[100:-100], atol=1e-3)
+
+        blocks = [x[i : i + 517] for i in range(0, len(x), 517)]
+        r = Resampler(44100, 48000)
+        z = np.concatenate([r.process(b) for b in blocks] + [r.flush()])
+        assert_array_equal(y, z)
+
+    def test_down(self):
+        x = np.ones((9000, 2))
+        x[:, 1] = -0.25
+        r = Resampler(48000, 16000, channels=2)
+        y = np.concatenate([r.process(x), r.flush()])
+        assert y.shape == (3000, 2)
+        assert_allclose(y[50:-50], [[1, -0.25]] * 2900, atol=1e-3)
+
+    def test_stopband(self):
+        def decibels(source_rate, sample_rate, frequency):
+            r = Resampler(source_rate, sample_rate)
+            x = _sine(source_rate, source_rate, frequency)
+            y = np.concatenate([r.process(x), r.flush()])[1000:-1000]
+            return 20 * np.log10(np.sqrt(2 * np.mean(y * y)) / 0.5)
+
+        assert decibels(48000, 16000, 9000) < -80
+        assert decibels(96000, 48000, 26000) < -80
+        assert decibels(48000, 44100, 23000) < -80
+        assert abs(decibels(48000, 16000, 6000)) < 0.01
+
+    @tdir
+    def test_resample(self):
+        wm = wavemap(next(files.find("M1F1-int16-")))
+        out = wavemap.resample(wm, "up.wav", 11025, frames=5000)
+        assert out.sample_rate == 11025 and out.dtype == wm.dtype
+        assert out.shape == (-(-len(wm) * 11025 // 8000), 2)
+
+        back = wavemap("up.wav")
+        assert back.sample_rate == 11025
+        assert_array_equal(back, out)
+
+        threaded = wavemap.resample(wm, "up2.wav", 11025, frames=3000, threads=2)
+        assert_array_equal(threaded, out)
+
+        f = wavemap.resample(wm, "f.wav", 11025, dtype="float32")
+        assert_allclose(wavemap.convert(out, "float32"), f, atol=1e-4)
+
+        with self.assertRaises(ValueError):
+            wavemap.resample(np.zeros(10), "x.wav", 48000)
@@ -0,0 +1,59 @@
+import socket
+import threading
+import unittest
+from pathlib import Path
+
+import numpy as np
+import tdir
+from numpy.testing import assert_array_equal
+
+import wavemap
+
+from . import files
+
+
+class TestSend(unittest.TestCase):
+    @tdir
+    def test_send(self):
+        wm = wavemap(next(files.find("int16")))
+        for arr, start, stop in (wm, 100, 1100), (wm[1:-1], -50, None):
+            assert_array_equal(_receive(arr, start, stop), arr[start:stop])
+
+    @tdir
+    def test_copy_on_write(self):
+        wm = wavemap(next(files.find("int16")), "c")
+        wm[:10] = 3
+        assert_array_equal(_receive(wm[:, 1], 0, 20), wm[:20, 1])
+
+    @tdir
+    def test_file_descriptor(self):
+        wm = wavemap(next(files.find("uint8-")))
+        with open("raw", "wb") as fp:
+            sent = wavemap.send_frames(wm, fp.fileno(), 10, 21, with_header=False)
+        assert sent == 22
+        assert Path("raw").read_bytes() == wm[10:21].tobytes()
+
+    def test_no_sample_rate(self):
+        with self.assertRaises(ValueError):
+            wavemap.send_frames(np.zeros(10, "int16"), 0)
+
+
+def _receive(arr, start, stop):
+    a, b = socket.socketpair()
+    received = []
+
+    def receive():
+        while data := b.recv(0x10000):
+            received.append(data)
+
+    thread = threading.Thread(target=receive)
+    thread.start()
+    with a:
+        sent = wavemap.send_frames(arr, a, start, stop)
+    thread.join()
+    b.close()
+
+    data = b"".join(received)
+    assert sent == len(data)
+    Path("received.wav").write_bytes(data)
+    return wavemap("received.wav")
@@ -0,0 +1,59 @@
+import os
+import unittest
+
+import numpy as np
+import tdir
+from numpy.testing import assert_array_equal
+
+import wavemap
+from wavemap import Activity, Ranges
+
+
+def _write(name):
+    wm = wavemap(name, "w", dtype="int16", shape=(50000, 2), sample_rate=8000)
+    wm[:] = 0
+    wm[1000:2000, 0] = 1000
+    wm[2010:2500, 1] = -1000
+    wm[2600, 0] = 30
+    wm[40000:45000] = 500
+    wm.flush()
+    return wm
+
+
+class TestSilence(unittest.TestCase):
+    def test_find_active(self):
+        x = np.zeros(1000, "float32")
+        x[[10, 11, 12, 20, 500, 999]] = 0.5
+        x[600] = 0.0005
+
+        found = wavemap.find_active(x, frames=64, threads=2)
+        assert found == [(10, 13), (20, 21), (500, 501), (999, 1000)]
+
+        found = wavemap.find_active(x, min_silence=10, frames=64)
+        assert found == [(10, 21), (500, 501), (999, 1000)]
+
+        assert wavemap.find_active(x, threshold=0.0001) == Ranges(
+            [(10, 13), (20, 21), (500, 501), (600, 601), (999, 1000)]
+        )
+
+    @tdir
+    def test_activity(self):
+        wm = _write("a.wav")
+
+        act = Activity("a.wav", min_silence=100)
+        assert act.ranges == [(1000, 2500), (40000, 45000)]
+        assert act.frames == 6500
+
+        views = list(act.regions(2000, 41000))
+        assert [len(v) for v in views] == [500, 1000]
+        assert np.shares_memory(views[0], act.source)
+        assert_array_equal(views[1], wm[40000:41000])
+
+        assert os.path.exists("a.wav.activity")
+        assert Activity("a.wav", min_silence=100)._load() == act.ranges
+        act5 = Activity("a.wav", min_silence=5)
+        assert act5.ranges == [(1000, 2000), (2010, 2500), (40000, 45000)]
+
+        act = Activity("a.wav", threshold=0.0005)
+        assert act.ranges == [(1000, 2000), (2010, 2500), (2600, 2601), (40000, 45000)]
+        assert len(list(act)) == 4
@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+import wavemap
+from wavemap import blocks
+
+from . import files
+
+
+class TestStack(unittest.TestCase):
+    def test_stack(self):
+        names = [next(files.find(s)) for s in ("int16-", "int16WE", "int16-")]
+        maps = [wavemap(n) for n in names]
+        expected = np.stack(maps)
+
+        sm = wavemap.StackMap(names)
+        assert sm.shape == expected.shape == (3, 23493, 2)
+        assert len(sm) == 3 and sm.frames == 23493
+        assert_array_equal(sm, expected)
+
+        for key in (1, (2, slice(10, 20)), (slice(None), -1), (slice(1, 3), 5, 1)):
+            assert_array_equal(sm[key], expected[key])
+
+        assert np.shares_memory(sm[1], sm.maps[1])
+
+    def test_blocks(self):
+        wm = wavemap(next(files.find("Tom")))
+        sm = wavemap.StackMap([wm, wm[::-1]])
+        assert sm.shape == (2, len(wm), 1)
+
+        parts = list(blocks.blocks(sm, 4000))
+        assert [p.shape for p in parts] == [(2, 4000, 1)] * 2 + [(2, 2288, 1)]
+        assert np.shares_memory(parts[0], parts[-1])
+        assert_array_equal(parts[-1][1, :, 0], wm[2287::-1])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            wavemap.StackMap([])
+        with self.assertRaises(ValueError):
+            wavemap.StackMap([next(files.find("Kick")), next(files.find("Snare"))])
+        with self.assertRaises(ValueError):
+            wavemap.StackMap([np.zeros(3, "int16"), np.zeros(3, "int32")])
@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+
+import wavemap
+
+from . import files
+
+
+class TestStats(unittest.TestCase):
+    def test_stats(self):
+        for name in "M1F1-int16-", "M1F1-float32-", "M1F1-uint8-":
+            wm = wavemap(next(files.find(name)))
+            x = np.array(wm, "float64")
+            if wm.dtype == np.uint8:
+                x -= 128
+
+            for threads in 1, 3:
+                total, windows = wavemap.stats(wm, frames=5000, threads=threads)
+                assert windows is None
+                assert_array_equal(total.min, x.min(0))
+                assert_array_equal(total.max, x.max(0))
+                assert_array_equal(total.peak, np.abs(x).max(0))
+                assert_allclose(total.rms, np.sqrt(np.mean(x * x, 0)))
+                assert_allclose(total.dc, x.mean(0))
+                assert total.frames == len(wm)
+
+    def test_windows(self):
+        wm = wavemap(next(files.find("M1F1-int16-")))
+        total, windows = wavemap.stats(wm, window=1000, frames=4500)
+        assert windows.min.shape == (24, 2)
+        assert list(windows.frames) == [1000] * 23 + [493]
+
+        x = np.array(wm, "float64")
+        for i in 0, 4, 5, 23:
+            part = x[1000 * i : 1000 * (i + 1)]
+            assert_array_equal(windows.max[i], part.max(0))
+            assert_allclose(windows.rms[i], np.sqrt(np.mean(part * part, 0)))
+
+        assert_array_equal(total.max, windows.max.max(0))
+
+    def test_clipped(self):
+        x = np.array([0, 0x7FFF, -0x8000, 0x7FFF, 5], "int16")
+        total, _ = wavemap.stats(x)
+        assert list(total.clipped) == [3]
+
+        y = np.array([[0.5, 1.0], [-1.5, 0], [2, 0]], "float32")
+        total, windows = wavemap.stats(y, window=2)
+        assert list(total.clipped) == [2, 1]
+        assert windows.clipped.tolist() == [[1, 1], [1, 0]]
+
+        z = np.array([128, 255, 0, 130], "uint8")
+        total, _ = wavemap.stats(z)
+        assert (total.min, total.max, total.peak, total.dc) == (-128, 127, 128, 0.25)
+        assert list(total.clipped) == [2]
+
+        for dtype in "uint16", "uint32":
+            top = np.iinfo(dtype).max
+            u = np.array([top // 2 + 1, top, 0], dtype)
+            total, _ = wavemap.stats(u)
+            assert (total.min, total.max, total.dc) == (
+                -(top // 2 + 1),
+                top // 2,
+                -1 / 3,
+            )
+
+        with self.assertRaises(ValueError):
+            wavemap.stats(x[:0])
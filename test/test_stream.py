@@ -0,0 +1,171 @@
+import io
+import os
+import threading
+import time
+import unittest
+
+import numpy as np
+import tdir
+from numpy.testing import assert_array_equal
+
+import wavemap
+from wavemap import StreamReader, StreamWriter
+
+from . import files
+
+
+def _pipe(data):
+    read, write = os.pipe()
+
+    def writer():
+        with open(write, "wb") as fp:
+            fp.write(data)
+
+    threading.Thread(target=writer, daemon=True).start()
+    return open(read, "rb", buffering=0)
+
+
+class TestStreamReader(unittest.TestCase):
+    def test_files(self):
+        for name in "M1F1-int16-", "M1F1-float32WE", "6_Channel", "Tom", "Kick":
+            filename = next(files.find(name))
+            wm = wavemap(filename)
+            with _pipe(filename.read_bytes()) as fp:
+                sr = StreamReader(fp, frames=5000, warn=lambda m: 0)
+                assert sr.dtype == wm.dtype and sr.sample_rate == wm.sample_rate
+                assert sr.channel_mask == wm.channel_mask
+                parts = [np.array(b) for b in sr]
+
+            assert all(len(p) <= 5000 for p in parts)
+            assert_array_equal(np.concatenate(parts), wm)
+            assert sr.frames_read == len(wm)
+
+    def test_unknown_size(self):
+        filename = next(files.find("M1F1-int16-"))
+        wm = wavemap(filename)
+        data = bytearray(filename.read_bytes())
+        data[4:8] = b"\xff" * 4
+        i = data.index(b"data")
+        data[i + 4 : i + 8] = bytes(4)
+        data = data[: wm.offset + wm.nbytes] + b"\1\2\3"
+
+        warnings = []
+        sr = StreamReader(io.BytesIO(data), frames=1000, warn=warnings.append)
+        blocks = list(sr.blocks())
+        assert blocks[0].base is blocks[1].base
+        assert sr.frames_read == len(wm)
+        assert warnings == ["Stream ended 3 bytes into a frame"]
+
+        sr = StreamReader(io.BytesIO(data), frames=len(wm) + 1, always_2d=True)
+        assert_array_equal(next(iter(sr)), wm)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            StreamReader(io.BytesIO(b"RIFF"))
+        with self.assertRaises(ValueError):
+            StreamReader(io.BytesIO(b"RIFF\0\0\0\0WAVEdata\0\0\0\0"))
+
+
+class TestStreamWriter(unittest.TestCase):
+    def test_pipe(self):
+        wm = wavemap(next(files.find("M1F1-int16-")))
+        read, write = os.pipe()
+        result = []
+
+        def reader():
+            with open(read, "rb", buffering=0) as fp:
+                sr = StreamReader(fp, frames=len(wm) + 1)
+                result.extend(np.array(b) for b in sr)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        with open(write, "wb") as fp:
+            sw = StreamWriter(fp, "float32", 2, wm.sample_rate, batch_bytes=0x1000)
+            for block in wavemap.blocks.blocks(wm, 1000):
+                sw.write(block)
+            sw.close()
+        thread.join()
+
+        assert_array_equal(result[0], wavemap.convert(wm, np.float32))
+        assert sw.frames_written == len(wm)
+
+    @tdir
+    def test_known_frames(self):
+        wm = wavemap(next(files.find("Tom")))
+        with open("out.wav", "wb") as fp:
+            sw = StreamWriter(fp, wm.dtype, 1, wm.sample_rate, frames=len(wm))
+            buffer = np.empty(999, wm.dtype)
+            for begin in range(0, len(wm), 999):
+                part = wm[begin : begin + 999]
+                buffer[: len(part)] = part
+                sw.write(buffer[: len(part)])
+                buffer[:] = 0
+            sw.close()
+
+            with self.assertRaises(ValueError):
+                sw.write(buffer)
+
+        assert_array_equal(wavemap("out.wav"), wm)
+
+    def test_unknown_frames(self):
+        wm = wavemap(next(files.find("6_Channel")))[:1001, :3]
+        expected = wavemap.convert(wm, np.uint8)
+        out = io.BytesIO()
+        with StreamWriter(out, np.uint8, 3, 44100) as sw:
+            sw.write(wm[:500])
+            sw.write(wm[500:])
+
+        data = out.getvalue()
+        assert len(data) == 44 + expected.nbytes + 1
+        assert int.from_bytes(data[4:8], "little") == len(data) - 8
+        sr = StreamReader(io.BytesIO(data), frames=2000)
+        assert sr.remaining == expected.nbytes
+        assert_array_equal(next(iter(sr)), expected)
+
+    def test_non_blocking(self):
+        x = np.arange(200000, dtype=np.int16)
+        read, write = os.pipe()
+        os.set_blocking(write, False)
+        result = []
+
+        def reader():
+            time.sleep(0.05)
+            with open(read, "rb", buffering=0) as fp:
+                result.extend(np.array(b) for b in StreamReader(fp))
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        with open(write, "wb") as fp:
+            sw = StreamWriter(fp, np.int16, 1, 8000, batch_bytes=len(x) * 2)
+            sw.write(x)
+            sw.close()
+        thread.join()
+
+        assert_array_equal(np.concatenate(result), x)
+
+    @tdir
+    def test_seekable_file(self):
+        wm = wavemap(next(files.find("M1F1-float32-")))
+        with (
+            open("out.wav", "wb") as fp,
+            StreamWriter(fp, wm.dtype, 2, wm.sample_rate) as sw,
+        ):
+            for block in wavemap.blocks.blocks(wm, 1000):
+                sw.write(block)
+
+        out = wavemap("out.wav", warn=files.no_warnings)
+        assert_array_equal(out, wm)
+        assert out.sample_rate == wm.sample_rate
+
+    def test_errors(self):
+        warnings = []
+        sw = StreamWriter(
+            io.BytesIO(), np.int16, 2, 8000, frames=10, warn=warnings.append
+        )
+        with self.assertRaises(ValueError):
+            sw.write(np.zeros(3, np.int16))
+        with self.assertRaises(ValueError):
+            sw.write(np.zeros((11, 2), np.int16))
+        sw.write(np.zeros((3, 2), np.int16))
+        sw.close()
+        assert warnings == ["Wrote 3 of 10 frames"]
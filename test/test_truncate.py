@@ -0,0 +1,59 @@
+import unittest
+from pathlib import Path
+
+import numpy as np
+import tdir
+from numpy.testing import assert_array_equal
+
+import wavemap
+
+from . import files
+
+
+class TestTruncate(unittest.TestCase):
+    @tdir
+    def test_tail(self):
+        for s in "int16", "float32", "uint8-":
+            filename = files.copy(s)
+            expected = np.array(wavemap(filename))
+            size = Path(filename).stat().st_size
+
+            assert wavemap.truncate(filename, 1001) == 1001
+            wm = wavemap(filename, warn=files.no_warnings)
+            assert_array_equal(wm, expected[:1001])
+            assert size - Path(filename).stat().st_size == expected[1001:].nbytes
+
+    @tdir
+    def test_head(self):
+        filename = files.copy("int16")
+        expected = np.array(wavemap(filename))
+        size = Path(filename).stat().st_size
+
+        assert wavemap.truncate(filename, start=100) == len(expected) - 100
+        assert_array_equal(wavemap(filename, warn=files.no_warnings), expected[100:])
+        assert Path(filename).stat().st_size == size
+
+        wavemap.truncate(filename, 50, start=3)
+        assert_array_equal(wavemap(filename, warn=files.no_warnings), expected[103:153])
+
+    @tdir
+    def test_trailing_chunks(self):
+        wm = wavemap(next(files.find("int16")))
+        wavemap.copy_to(wm, "test.wav", roffset=0)
+        with open("test.wav", "ab") as fp:
+            fp.write(b"LIST\x04\x00\x00\x00abcd")
+        with open("test.wav", "r+b") as fp:
+            fp.seek(4)
+            fp.write((Path("test.wav").stat().st_size - 8).to_bytes(4, "little"))
+
+        wavemap.truncate("test.wav", 10, start=20)
+        assert_array_equal(wavemap("test.wav", warn=files.no_warnings), wm[20:30])
+        assert Path("test.wav").read_bytes().endswith(b"LIST\x04\x00\x00\x00abcd")
+
+    @tdir
+    def test_errors(self):
+        filename = files.copy("int16")
+        with self.assertRaises(ValueError):
+            wavemap.truncate(filename, start=1)
+        with self.assertRaises(ValueError):
+            wavemap.truncate(filename, 10**9)
@@ -2,6 +2,7 @@ import struct
 import unittest
 from pathlib import Path
 
+import numpy as np
 import tdir
 from numpy.testing import assert_array_equal
 
@@ -107,3 +108,34 @@ def _test(filename, hard=False, assert_array_equal=assert_array_equal):
         assert max(abs(f - b) for f, b in zip(file_sizes, byte_sizes)) <= 188
 
     return wm, b
+
+
+class TestCopyChunks(unittest.TestCase):
+    @tdir
+    def test_copy_chunks(self):
+        filename = next(files.find("int16-"))
+        wm = wavemap(filename)
+        copy = wavemap.copy_to(wm, "copy.wav", chunks=True)
+        copy.flush()
+        assert copy.file_size == Path("copy.wav").stat().st_size
+
+        def payloads(w):
+            with open(w.filename, "rb") as fp:
+                result = []
+                for c in w.chunks:
+                    fp.seek(c.data)
+                    result.append((c.tag, fp.read(c.size)))
+                return result
+
+        actual = wavemap("copy.wav", warn=files.no_warnings)
+        assert_array_equal(actual, wm)
+        assert payloads(actual)[2:] == payloads(wm)[2:]
+        assert [c.tag for c in actual.chunks][2:] == [b"afsp", b"LIST"]
+
+    def test_copy_chunks_error(self):
+        with self.assertRaises(ValueError):
+            wavemap.copy_to(np.zeros(10, "int16"), "copy.wav", chunks=True)
+
+        wm = wavemap(next(files.find("int16-")))
+        with self.assertRaises(ValueError):
+            wavemap.copy_to(wm, "copy.wav", roffset=10, chunks=True)
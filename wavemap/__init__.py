@@ -33,20 +33,69 @@ from collections.abc import Callable
 import numpy as np
 import xmod
 
+from . import blocks as blocks
+from . import chunks as chunks
 from . import docs
-from .convert import convert
+from .aio import aiter_blocks
+from .channels import ChannelMap, downmix, select_channels
+from .concat import ConcatMap
+from .convolve import Convolver, convolve
+from .convert import apply_gain, convert, normalize, peak, prevent_clipping
+from .dither import Dither
+from .mix import Source, mix
+from .overlay import Overlay
+from .overview import Overview
+from .planar import PlanarCache, write_planar
+from .ranges import Ranges
 from .raw import RawMap, warn
 from .read import ReadMap as ReadMap
+from .resample import Resampler, resample
+from .send import send_frames
+from .silence import Activity, find_active
+from .stack import StackMap
+from .stats import Stats, stats
+from .stream import StreamReader, StreamWriter
+from .truncate import truncate
 from .write import WriteMap as WriteMap
 
 __all__ = (
     "wavemap",
+    "Activity",
+    "ChannelMap",
+    "ConcatMap",
+    "Convolver",
+    "Dither",
+    "Overlay",
+    "Overview",
+    "PlanarCache",
+    "Ranges",
     "RawMap",
     "ReadMap",
+    "Resampler",
+    "Source",
+    "StackMap",
+    "Stats",
+    "StreamReader",
+    "StreamWriter",
     "WriteMap",
     "copy_to",
     "new_like",
+    "aiter_blocks",
+    "apply_gain",
     "convert",
+    "convolve",
+    "downmix",
+    "find_active",
+    "mix",
+    "normalize",
+    "peak",
+    "prevent_clipping",
+    "resample",
+    "select_channels",
+    "send_frames",
+    "stats",
+    "truncate",
+    "write_planar",
 )
 
 copy_to = WriteMap.copy_to
@@ -76,6 +125,8 @@ def wavemap(
     #
     # Read and write parameters
     #
+    durability: str | float = "none",
+    track_dirty: bool = False,
     warn: Callable | None = warn,
 ):
     """
@@ -103,6 +154,8 @@ def wavemap(
             shape=shape,
             sample_rate=sample_rate,
             roffset=roffset,
+            durability=durability,
+            track_dirty=track_dirty,
             warn=warn,
         )
     else:
@@ -116,6 +169,8 @@ def wavemap(
             mode=mode,
             order=order,
             always_2d=always_2d,
+            durability=durability,
+            track_dirty=track_dirty,
             warn=warn,
         )
         if dtype is not None:
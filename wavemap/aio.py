@@ -0,0 +1,104 @@
+"""Read blocks of WAVE files from asyncio code without blocking the event loop"""
+
+import asyncio
+import functools
+import weakref
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from . import blocks, raw
+from .read import ReadMap
+
+IO_THREADS = 8  # The number of threads in the shared executor
+MAX_READS = 64  # The most reads in flight at once, for each event loop
+
+_EXECUTOR = None
+_LIMITS = weakref.WeakKeyDictionary()
+
+
+async def aiter_blocks(
+    path: str | Path,
+    frames: int = blocks.DEFAULT_FRAMES,
+    prefetch: int = 1,
+    always_2d: bool = False,
+    executor: Executor | None = None,
+    limit: asyncio.Semaphore | None = None,
+    warn: Callable | None = raw.warn,
+) -> AsyncIterator[np.ndarray]:
+    """
+    Yield copies of successive blocks of a WAVE file, at most `frames` frames
+    long.
+
+    The file is opened and every block is read in an executor, so page faults
+    happen there and never on the event loop.  Reads from all files share
+    one semaphore, so thousands of streams can be open at once with only
+    a bounded number of reads in flight.
+
+    ARGUMENTS
+      path
+        The WAVE file to read
+
+      frames
+        The largest number of frames in each block
+
+      prefetch
+        How many blocks to read ahead while the caller works on the
+        current one.  Reading stops there until the caller catches up.
+
+      always_2d
+        If true, mono files are read as matrices with one column
+
+      executor
+        The executor for the reads.  If None, a shared thread pool of
+        `IO_THREADS` threads is used.
+
+      limit
+        A semaphore bounding the number of reads in flight.  If None, one
+        semaphore of `MAX_READS` is shared by every call on the event loop.
+
+      warn
+        Passed to `ReadMap`
+    """
+    loop = asyncio.get_running_loop()
+    executor = executor or _executor()
+    limit = limit or _LIMITS.setdefault(loop, asyncio.Semaphore(MAX_READS))
+
+    async def run(function, *args):
+        async with limit:
+            return await loop.run_in_executor(executor, function, *args)
+
+    open_map = functools.partial(ReadMap, always_2d=always_2d, warn=warn)
+    wm = await run(open_map, path)
+
+    ranges = blocks.ranges(len(wm), frames)
+    pending = deque()
+
+    def fill(count):
+        while len(pending) < count and (r := next(ranges, None)):
+            pending.append(asyncio.ensure_future(run(_copy, wm, *r)))
+
+    try:
+        fill(1)
+        while pending:
+            block = await pending.popleft()
+            fill(prefetch)
+            yield block
+            fill(1)
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _copy(wm, begin, end):
+    return np.array(wm[begin:end])
+
+
+def _executor():
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(IO_THREADS, thread_name_prefix="wavemap-aio")
+    return _EXECUTOR
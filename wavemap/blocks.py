@@ -0,0 +1,114 @@
+"""Read and write audio arrays in blocks of frames"""
+
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_FRAMES = 0x10000
+
+
+def ranges(
+    count: int, frames: int = DEFAULT_FRAMES, start: int = 0
+) -> Iterator[tuple[int, int]]:
+    """Yield `(begin, end)` pairs that split `[start, count)` into blocks"""
+    if frames <= 0:
+        raise ValueError(f"Block size must be positive: {frames}")
+
+    for begin in range(start, count, frames):
+        yield begin, min(begin + frames, count)
+
+
+def blocks(arr: np.ndarray, frames: int = DEFAULT_FRAMES) -> Iterator[np.ndarray]:
+    """
+    Yield successive views of `arr`, each at most `frames` frames long.
+
+    Array-like classes like `ConcatMap` that have their own `blocks()` method
+    use that instead.
+    """
+    if method := getattr(arr, "blocks", None):
+        yield from method(frames)
+    else:
+        for begin, end in ranges(len(arr), frames):
+            yield arr[begin:end]
+
+
+def map_ranges(
+    function: Callable, ranges: Iterable[tuple[int, int]], threads: int = 1
+) -> Iterator:
+    """
+    Call `function(begin, end)` for each range and yield the results in
+    order, spread over a pool of `threads` threads if there is more than one.
+
+    numpy releases the GIL inside most operations on large blocks, so the
+    threads really do run at the same time.
+    """
+    if threads > 1:
+        with ThreadPoolExecutor(threads) as pool:
+            yield from pool.map(lambda r: function(*r), ranges)
+    else:
+        for begin, end in ranges:
+            yield function(begin, end)
+
+
+def write(arr: np.ndarray, block: np.ndarray, start: int = 0) -> int:
+    """
+    Write `block` into `arr` starting at frame `start`, and return the frame
+    after the end of the block.
+    """
+    stop = start + len(block)
+    arr[start:stop] = block
+    mark_dirty(arr, start, stop)
+    return stop
+
+
+def write_blocks(arr: np.ndarray, blocks: Iterable[np.ndarray], start: int = 0) -> int:
+    """Write a sequence of blocks one after another into `arr`"""
+    for block in blocks:
+        start = write(arr, block, start)
+    return start
+
+
+def frames_first(arr: np.ndarray) -> np.ndarray:
+    """
+    Return `arr` with frames on the first axis: a transposed view of a map
+    opened with `order="F"`, or else `arr` itself
+    """
+    frame_bytes = getattr(arr, "_frame_bytes", None)
+    if frame_bytes and arr.ndim == 2 and arr.strides[0] != frame_bytes:
+        return arr.T if arr.strides[1] == frame_bytes else arr
+    return arr
+
+
+def mark_dirty(arr: np.ndarray, start: int = 0, stop: int | None = None):
+    """Record that frames of `arr` were changed, if `arr` is tracking them"""
+    if getattr(arr, "dirty", None) is not None:
+        arr.mark_dirty(start, arr._frame_count() if stop is None else stop)
+
+
+def split_key(key, count: int, name: str = "array") -> tuple:
+    """
+    Split an index into an array of `count` frames into `(start, stop, local,
+    rest)`, where `[start, stop)` covers every frame the index touches and
+    `(local, *rest)` indexes a block holding just those frames.
+    """
+    first, *rest = key if isinstance(key, tuple) else (key,)
+    if first is Ellipsis:
+        first, rest = slice(None), [Ellipsis, *rest]
+
+    if isinstance(first, slice):
+        frames = range(*first.indices(count))
+        if not frames:
+            return 0, 0, slice(0, 0), rest
+
+        start, stop = min(frames), max(frames) + 1
+        end = frames.stop - start
+        end = None if end < 0 else end
+        return start, stop, slice(frames.start - start, end, frames.step), rest
+
+    try:
+        index = range(count)[first]
+    except TypeError:
+        raise TypeError(f"Cannot index {name} frames with {first!r}") from None
+
+    return index, index + 1, 0, rest
@@ -0,0 +1,184 @@
+"""Select and mix the channels of an array lazily, a block at a time"""
+
+import math
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+
+from . import blocks
+from .convert import convert
+
+# The speaker for each bit of dwChannelMask, lowest bit first
+SPEAKERS = (
+    "FL",  # Front left
+    "FR",  # Front right
+    "FC",  # Front center
+    "LFE",  # Low frequency
+    "BL",  # Back left
+    "BR",  # Back right
+    "FLC",  # Front left of center
+    "FRC",  # Front right of center
+    "BC",  # Back center
+    "SL",  # Side left
+    "SR",  # Side right
+    "TC",  # Top center
+    "TFL",  # Top front left
+    "TFC",  # Top front center
+    "TFR",  # Top front right
+    "TBL",  # Top back left
+    "TBC",  # Top back center
+    "TBR",  # Top back right
+)
+
+LEFT = "FL", "FLC", "BL", "SL", "TFL", "TBL"
+RIGHT = "FR", "FRC", "BR", "SR", "TFR", "TBR"
+CENTER = "FC", "BC", "TC", "TFC", "TBC"
+MINUS_3DB = 1 / math.sqrt(2)
+
+# The usual channel masks for files that don't have one
+DEFAULT_MASKS = {1: 0x4, 2: 0x3, 4: 0x33, 6: 0x3F, 8: 0x63F}
+
+
+def layout(mask: int | None, count: int) -> tuple[str | None, ...]:
+    """
+    Return the speaker of each of `count` channels from a channel mask, with
+    None for channels past the bits that are set.  If there is no mask, the
+    usual layout for `count` channels is used.
+    """
+    mask = mask or DEFAULT_MASKS.get(count, 0)
+    speakers = [s for i, s in enumerate(SPEAKERS) if mask >> i & 1]
+    return tuple(speakers[:count]) + (None,) * (count - len(speakers))
+
+
+class ChannelMap:
+    """
+    A lazy view of some of the channels of an array, or of mixes of them.
+
+    Nothing is read until frames are asked for.  Then each block of whole
+    frames is read once, in order, and the channels are gathered or mixed
+    into a new contiguous array, so there is never a strided scan over the
+    file for each channel.
+    """
+
+    def __init__(
+        self,
+        arr: np.ndarray,
+        channels: Sequence[int | str] | None = None,
+        matrix: np.ndarray | None = None,
+    ):
+        """
+        ARGUMENTS
+          arr
+            A numpy array or `ReadMap`
+
+          channels
+            The channels to select, by index or by speaker name, like "FL"
+
+          matrix
+            A matrix with one row for each channel of `arr`, and one column
+            for each channel of the result, used to mix them.  The result
+            has floating point samples.
+
+        Exactly one of `channels` and `matrix` must be set.
+        """
+        if (channels is None) == (matrix is None):
+            raise ValueError("Exactly one of channels and matrix must be set")
+
+        self.source = arr if arr.ndim > 1 else arr[:, None]
+        width = self.source.shape[1]
+        self.channels = self.matrix = None
+
+        if channels is not None:
+            names = _layout(arr)
+            self.channels = [_index(c, names, width) for c in channels]
+            self.dtype = arr.dtype
+            self.shape = (len(arr), len(self.channels))
+        else:
+            self.dtype = np.result_type(arr.dtype, np.float32)
+            self.matrix = np.asarray(matrix, self.dtype)
+            if self.matrix.ndim != 2 or self.matrix.shape[0] != width:
+                raise ValueError(f"Need a matrix with {width} rows")
+            self.shape = (len(arr), self.matrix.shape[1])
+
+    @property
+    def ndim(self) -> int:
+        return 2
+
+    @property
+    def sample_rate(self) -> int | None:
+        return getattr(self.source, "sample_rate", None)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __array__(self, dtype=None):
+        return self.read(0, len(self)).astype(dtype or self.dtype, copy=False)
+
+    def __getitem__(self, key):
+        start, stop, local, rest = blocks.split_key(key, len(self), "ChannelMap")
+        return self.read(start, stop)[(local, *rest)]
+
+    def read(self, start: int, stop: int, out: np.ndarray | None = None) -> np.ndarray:
+        """Compute frames `[start, stop)` into `out`, or into a new array"""
+        if out is None:
+            out = np.empty((stop - start, self.shape[1]), self.dtype)
+
+        block = self.source[start:stop]
+        if self.channels is not None:
+            np.take(block, self.channels, axis=1, out=out)
+        else:
+            np.matmul(convert(block, self.dtype), self.matrix, out=out)
+        return out
+
+    def blocks(self, frames: int = blocks.DEFAULT_FRAMES) -> Iterator[np.ndarray]:
+        """Yield new contiguous arrays of at most `frames` frames"""
+        for begin, end in blocks.ranges(len(self), frames):
+            yield self.read(begin, end)
+
+
+def select_channels(arr: np.ndarray, channels: Sequence[int | str]) -> ChannelMap:
+    """Return a lazy view of some channels of `arr`, by index or speaker name"""
+    return ChannelMap(arr, channels=channels)
+
+
+def downmix(arr: np.ndarray, matrix: np.ndarray | None = None) -> ChannelMap:
+    """
+    Return a lazy mix of the channels of `arr` through `matrix`.
+
+    If `matrix` is None, mix down to stereo using `arr.channel_layout`: left
+    and right speakers go to their own side, center speakers go to both at
+    -3dB, the LFE channel is dropped, and surround speakers are mixed in at
+    -3dB.  Channels with no position are dropped.
+    """
+    if matrix is None:
+        matrix = [_stereo(n) for n in _layout(arr)]
+    return ChannelMap(arr, matrix=matrix)
+
+
+def _layout(arr):
+    if names := getattr(arr, "channel_layout", None):
+        return names
+    return layout(None, 1 if arr.ndim == 1 else arr.shape[1])
+
+
+def _stereo(name):
+    if name in ("FL", "FR"):
+        return (1, 0) if name == "FL" else (0, 1)
+    if name in LEFT:
+        return MINUS_3DB, 0
+    if name in RIGHT:
+        return 0, MINUS_3DB
+    if name in CENTER:
+        return MINUS_3DB, MINUS_3DB
+    return 0, 0
+
+
+def _index(channel, names, width):
+    if isinstance(channel, str):
+        if channel not in names:
+            raise ValueError(f"No channel {channel!r} in {names}")
+        return names.index(channel)
+
+    if not -width <= channel < width:
+        raise IndexError(f"Channel {channel} out of range")
+    return channel % width
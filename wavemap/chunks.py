@@ -0,0 +1,216 @@
+"""Read and edit the chunks in a RIFF WAVE file without touching the samples"""
+
+from collections.abc import Callable
+from typing import NamedTuple
+
+from . import raw
+from .structure import wave
+
+JUNK = b"JUNK"
+LIST = b"LIST"
+INFO = b"INFO"
+FILLER_TAGS = JUNK, b"junk", b"PAD ", b"FLLR"
+
+
+class Chunk(NamedTuple):
+    tag: bytes
+    begin: int  # The position of the chunk header in the file
+    size: int  # The size of the chunk, not counting the header or pad
+
+    @property
+    def data(self) -> int:
+        """The position of the first byte after the chunk header"""
+        return self.begin + wave.CHUNK.size
+
+    @property
+    def end(self) -> int:
+        return self.data + self.size
+
+    @property
+    def padded_end(self) -> int:
+        return self.end + self.size % 2
+
+
+def read_chunks(
+    fp, file_size: int | None = None, warn: Callable | None = raw.warn
+) -> list[Chunk]:
+    """Read the table of chunks in an open WAVE file, after the RIFF header"""
+    warn = warn or (lambda _: None)
+    if file_size is None:
+        file_size = fp.seek(0, 2)
+
+    fp.seek(0)
+    riff = wave.RIFF.unpack_from(fp.read(wave.RIFF.size).ljust(wave.RIFF.size))
+    if riff.ckIDRiff != b"RIFF":
+        raise ValueError("Not a RIFF file")
+    if riff.WAVEID != b"WAVE":
+        raise ValueError(f"Not a WAVE file: {riff.WAVEID}")
+
+    result = []
+    position = wave.RIFF.size
+    while position + wave.CHUNK.size <= file_size:
+        fp.seek(position)
+        header = wave.CHUNK.unpack_from(fp.read(wave.CHUNK.size))
+        chunk = Chunk(header.ckID, position, header.cksize)
+        if not chunk.tag.rstrip().isalnum():
+            warn(f"Dubious tag {chunk.tag}")
+        if chunk.end > file_size:
+            warn(f"Incomplete chunk: {chunk.end} > {file_size}")
+            chunk = chunk._replace(size=file_size - chunk.data)
+
+        result.append(chunk)
+        position = chunk.end
+        if chunk.size % 2:
+            fp.seek(position)
+            if fp.read(1) == b"\0":
+                position += 1
+
+    if file_size - position > 1:
+        warn(f"Incomplete chunk: {file_size - position} bytes at the end")
+
+    return result
+
+
+def find(chunks: list[Chunk], tag: bytes) -> Chunk | None:
+    """Return the first chunk with a given tag, or None"""
+    return next((c for c in chunks if c.tag == tag), None)
+
+
+def chunk_header(tag: bytes, size: int) -> bytes:
+    """Return the eight byte header of a chunk"""
+    return wave.CHUNK.pack(ckID=tag, cksize=size)
+
+
+def read_chunk(
+    filename: str,
+    tag: bytes,
+    list_type: bytes | None = None,
+    warn: Callable | None = raw.warn,
+) -> bytes | None:
+    """
+    Return the contents of the first chunk with a given tag, or None.
+
+    For `LIST` chunks, `list_type` selects the list by its first four bytes.
+    """
+    with open(filename, "rb") as fp:
+        chunk = _find(fp, read_chunks(fp, warn=warn), tag, list_type)
+        if chunk:
+            fp.seek(chunk.data)
+            return fp.read(chunk.size)
+
+
+def write_chunk(
+    filename: str, tag: bytes, payload: bytes, warn: Callable | None = raw.warn
+) -> Chunk:
+    """
+    Add or replace a chunk in a WAVE file, without moving the samples.
+
+    An existing chunk with the same tag, or for `LIST` chunks, the same list
+    type, is overwritten in place if the new contents fit, with any leftover
+    space turned into a `JUNK` chunk.  Otherwise, the contents go into a
+    filler chunk that is large enough, or are appended to the end of the file,
+    and the old chunk becomes `JUNK`.
+    """
+    if tag in (b"data", b"fmt "):
+        raise ValueError(f"Cannot write a {tag} chunk")
+
+    with open(filename, "r+b") as fp:
+        table = read_chunks(fp, warn=warn)
+        old = _find(fp, table, tag, payload[:4] if tag == LIST else None)
+        size = wave.CHUNK.size + len(payload) + len(payload) % 2
+
+        file_size = fp.seek(0, 2)
+        for begin, room in _spaces(table, old):
+            at_end = begin + room >= file_size
+            if at_end or room == size or room >= size + wave.CHUNK.size:
+                break
+        else:
+            begin, at_end = file_size + file_size % 2, True
+
+        if old and old.begin != begin:
+            fp.seek(old.begin)
+            fp.write(JUNK)
+
+        fp.seek(begin)
+        fp.write(chunk_header(tag, len(payload)) + payload + b"\0" * (len(payload) % 2))
+        if at_end:
+            file_size = begin + size
+            fp.truncate(file_size)
+        elif room > size:
+            fp.write(chunk_header(JUNK, room - size - wave.CHUNK.size))
+
+        fp.seek(4)
+        fp.write((file_size - wave.CHUNK.size).to_bytes(4, "little"))
+
+    return Chunk(tag, begin, len(payload))
+
+
+def delete_chunk(
+    filename: str,
+    tag: bytes,
+    list_type: bytes | None = None,
+    warn: Callable | None = raw.warn,
+) -> bool:
+    """Turn the first chunk with a given tag into `JUNK`, if there is one"""
+    if tag in (b"data", b"fmt "):
+        raise ValueError(f"Cannot delete a {tag} chunk")
+
+    with open(filename, "r+b") as fp:
+        if chunk := _find(fp, read_chunks(fp, warn=warn), tag, list_type):
+            fp.seek(chunk.begin)
+            fp.write(JUNK)
+        return bool(chunk)
+
+
+def read_info(filename: str, warn: Callable | None = raw.warn) -> dict[str, str]:
+    """Read the text fields of the `LIST` `INFO` chunk, like `INAM` or `ICMT`"""
+    payload = read_chunk(filename, LIST, INFO, warn=warn) or INFO
+    result, position = {}, len(INFO)
+
+    while position + wave.CHUNK.size <= len(payload):
+        c = wave.CHUNK.unpack_from(payload, position)
+        position += wave.CHUNK.size
+        text = payload[position : position + c.cksize]
+        result[c.ckID.decode("latin-1")] = text.rstrip(b"\0").decode("latin-1")
+        position += c.cksize + c.cksize % 2
+
+    return result
+
+
+def write_info(
+    filename: str, info: dict[str, str], warn: Callable | None = raw.warn
+) -> Chunk:
+    """Replace the `LIST` `INFO` chunk with new text fields"""
+    parts = [INFO]
+    for k, v in info.items():
+        if len(k) != 4:
+            raise ValueError(f"INFO field names have four characters: {k!r}")
+        text = v.encode("latin-1") + b"\0"
+        parts.append(chunk_header(k.encode("latin-1"), len(text)) + text)
+        parts.append(b"\0" * (len(text) % 2))
+
+    return write_chunk(filename, LIST, b"".join(parts), warn=warn)
+
+
+def _find(fp, table, tag, list_type):
+    for chunk in table:
+        if chunk.tag == tag:
+            if list_type is None:
+                return chunk
+            fp.seek(chunk.data)
+            if fp.read(len(list_type)) == list_type:
+                return chunk
+
+
+def _spaces(table, old):
+    # Yield (begin, size) for each region that could hold a chunk: the old
+    # chunk first, then the filler chunks, each with the fillers after them
+    starts = [i for i, c in enumerate(table) if c.tag in FILLER_TAGS]
+    if old:
+        starts.insert(0, table.index(old))
+
+    for i in starts:
+        j = i + 1
+        while j < len(table) and table[j].tag in FILLER_TAGS:
+            j += 1
+        yield table[i].begin, table[j - 1].padded_end - table[i].begin
@@ -0,0 +1,117 @@
+import bisect
+from collections.abc import Callable, Iterator, Sequence
+from itertools import accumulate
+from pathlib import Path
+
+import numpy as np
+
+from . import blocks, raw
+from .read import ReadMap
+
+
+class ConcatMap:
+    """
+    Several compatible WAVE files or arrays, joined end to end into one long
+    array of frames without copying them
+    """
+
+    def __init__(
+        self,
+        maps: Sequence[np.ndarray | str | Path],
+        warn: Callable | None = raw.warn,
+    ):
+        """
+        ARGUMENTS
+          maps
+            A sequence of arrays, or of names of WAVE files to map with
+            `ReadMap`.  They must all have the same dtype, number of
+            channels and sample rate.
+
+          warn
+            Passed to `ReadMap` for each file name
+        """
+        self.maps = [
+            ReadMap(m, warn=warn) if isinstance(m, (str, Path)) else m for m in maps
+        ]
+        if not self.maps:
+            raise ValueError("ConcatMap needs at least one array")
+
+        first = self.maps[0]
+        for m in self.maps[1:]:
+            if m.dtype != first.dtype:
+                raise ValueError(f"Different dtypes: {m.dtype} != {first.dtype}")
+            if m.shape[1:] != first.shape[1:]:
+                raise ValueError(f"Different channels: {m.shape} != {first.shape}")
+            if getattr(m, "sample_rate", None) != self.sample_rate:
+                raise ValueError("Different sample rates")
+
+        # self.starts[i] is the first frame of self.maps[i]
+        self.starts = list(accumulate((len(m) for m in self.maps), initial=0))
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.maps[0].dtype
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self), *self.maps[0].shape[1:])
+
+    @property
+    def ndim(self) -> int:
+        return self.maps[0].ndim
+
+    @property
+    def sample_rate(self) -> int | None:
+        return getattr(self.maps[0], "sample_rate", None)
+
+    def __len__(self) -> int:
+        return self.starts[-1]
+
+    def __array__(self, dtype=None):
+        return self.read(0, len(self)).astype(dtype or self.dtype, copy=False)
+
+    def __getitem__(self, key):
+        start, stop, local, rest = blocks.split_key(key, len(self), "ConcatMap")
+        if start < stop:
+            i, begin = self.locate(start)
+            if stop <= self.starts[i + 1]:
+                view = self.maps[i][begin : begin + stop - start]
+                return view[(local, *rest)]
+
+        return self.read(start, stop)[(local, *rest)]
+
+    def locate(self, frame: int) -> tuple[int, int]:
+        """Return the index of the map holding a frame, and the frame in it"""
+        if not 0 <= frame < len(self):
+            raise IndexError(f"Frame {frame} out of range")
+        i = bisect.bisect_right(self.starts, frame) - 1
+        return i, frame - self.starts[i]
+
+    def read(self, start: int, stop: int, out: np.ndarray | None = None) -> np.ndarray:
+        """Copy frames `[start, stop)` into `out`, or into a new array"""
+        if out is None:
+            out = np.empty((stop - start, *self.shape[1:]), self.dtype)
+
+        for i, begin, end in self._pieces(start, stop):
+            offset = self.starts[i]
+            piece = self.maps[i][begin - offset : end - offset]
+            out[begin - start : end - start] = piece
+
+        return out
+
+    def blocks(self, frames: int = blocks.DEFAULT_FRAMES) -> Iterator[np.ndarray]:
+        """
+        Yield blocks of at most `frames` frames: views into the underlying
+        arrays, except for blocks that straddle two of them, which are copies
+        """
+        for begin, end in blocks.ranges(len(self), frames):
+            yield self[begin:end]
+
+    def _pieces(self, start, stop):
+        # Yield each map that overlaps [start, stop), with the overlap
+        if start < stop:
+            first = self.locate(start)[0]
+            for i in range(first, len(self.maps)):
+                if self.starts[i] >= stop:
+                    break
+                yield i, max(start, self.starts[i]), min(stop, self.starts[i + 1])
@@ -1,10 +1,20 @@
+import threading
 from typing import Optional
 
 import numpy as np
 from numpy.lib.stride_tricks import as_strided
 
+from . import blocks
+from .dither import Dither, to_dither
 
-def convert(arr: np.ndarray, dtype: np.dtype | None, must_copy: bool = False):
+
+def convert(
+    arr: np.ndarray,
+    dtype: np.dtype | None,
+    must_copy: bool = False,
+    dither: Dither | str | None = None,
+    start: int = 0,
+):
     """
     Returns a copy of a numpy array or matrix that represents audio data in
     another type, scaling and shifting as necessary.
@@ -18,6 +28,14 @@ def convert(arr: np.ndarray, dtype: np.dtype | None, must_copy: bool = False):
 
       must_copy
         If true, `arr` is copied even if it is already the requested type
+
+      dither
+        A `Dither`, or one of `dither.DITHERS`, to add noise to floating point
+        samples before they are rounded to integers.  None means no dither.
+
+      start
+        The frame of the whole signal where `arr` starts, so that each block
+        of a stream converted one block at a time gets its own dither noise
     """
     old_t = arr.dtype
     new_t = dtype and np.dtype(dtype) or old_t
@@ -47,6 +65,8 @@ def convert(arr: np.ndarray, dtype: np.dtype | None, must_copy: bool = False):
 
         result = (ii.max - ii.min) / 2 * arr
         result += (ii.max + ii.min) / 2
+        if dither := to_dither(dither):
+            dither.add(result, start)
 
         # Arithmetic is uncertain and overs audible.
         np.clip(result, ii.min, ii.max, out=result)
@@ -75,18 +95,152 @@ def convert(arr: np.ndarray, dtype: np.dtype | None, must_copy: bool = False):
     return result
 
 
-def normalize(arr):
-    _normalize(arr, True)
+def normalize(
+    arr: np.ndarray, frames: int = blocks.DEFAULT_FRAMES, threads: int = 1
+) -> float:
+    """
+    Scale an array in place so that its loudest sample is at full scale, and
+    return the gain that was applied.
+
+    The array is read once to find its peak, and then scaled a block at a
+    time, so a mapped file is never all in memory at once.
+    """
+    return _normalize(arr, True, frames, threads)
+
+
+def prevent_clipping(
+    arr: np.ndarray, frames: int = blocks.DEFAULT_FRAMES, threads: int = 1
+) -> float:
+    """
+    Like `normalize()`, but only scale `arr` if its loudest sample is past
+    full scale, which can only happen with floating point samples
+    """
+    return _normalize(arr, False, frames, threads)
+
+
+def peak(
+    arr: np.ndarray, frames: int = blocks.DEFAULT_FRAMES, threads: int = 1
+) -> float:
+    """
+    Return the level of the loudest sample of an array as a fraction of full
+    scale, reading each block once
+    """
+    arr = blocks.frames_first(arr)
+    levels = list(
+        blocks.map_ranges(
+            lambda b, e: _min_max(arr[b:e]), _ranges(arr, frames), threads
+        )
+    )
+    if not levels:
+        return 0
+
+    center, bottom, top = _full_scale(arr.dtype)
+    lo = min(lo for lo, _ in levels)
+    hi = max(hi for _, hi in levels)
+    return max((hi - center) / (top - center), (lo - center) / (bottom - center))
+
+
+def apply_gain(
+    arr: np.ndarray,
+    gain: float,
+    dither: Dither | str | None = None,
+    clip: bool = True,
+    frames: int = blocks.DEFAULT_FRAMES,
+    threads: int = 1,
+) -> np.ndarray:
+    """
+    Multiply the samples of an array by `gain` in place, one block at a time,
+    and return the array.
+
+    Integer samples are scaled, dithered, rounded and saturated in one
+    scratch buffer per thread, the size of a block, and then written back, so
+    each sample is read and written once.
+
+    ARGUMENTS
+      arr
+        A numpy array, usually a `ReadMap` opened with mode `r+`
+
+      gain
+        The factor to multiply each sample by
+
+      dither
+        A `Dither`, or one of `dither.DITHERS`, to add noise to integer
+        samples before they are rounded.  None means no dither.
+
+      clip
+        If true, floating point samples are clipped to [-1, 1].  Integer
+        samples are always saturated at the limits of their type.
+
+      frames
+        The number of frames in each block
+
+      threads
+        If more than one, blocks are scaled in parallel by this many threads
+    """
+    result, arr = arr, blocks.frames_first(arr)
+    dither = to_dither(dither)
+    center, bottom, top = _full_scale(arr.dtype)
+    is_int = issubclass(arr.dtype.type, np.integer)
+    dtype = np.result_type(arr.dtype, np.float32)
+    offset = center * (1 - gain)
+    local = threading.local()
+
+    def scale(begin, end):
+        block = arr[begin:end]
+        if not is_int:
+            block *= gain
+            if clip:
+                np.clip(block, bottom, top, out=block)
+
+        else:
+            if not hasattr(local, "buffer"):
+                shape = (min(frames, len(arr)), *arr.shape[1:])
+                local.buffer = np.empty(shape, dtype)
+
+            s = local.buffer[: end - begin]
+            np.multiply(block, dtype.type(gain), out=s)
+            if offset:
+                s += offset
+            if dither:
+                s += dither.noise(begin, s.shape, dtype)
+
+            np.rint(s, out=s)
+            np.clip(s, bottom, top, out=s)
+            np.copyto(block, s, casting="unsafe")
+
+        blocks.mark_dirty(arr, begin, end)
+
+    for _ in blocks.map_ranges(scale, _ranges(arr, frames), threads):
+        pass
+
+    return result
+
+
+def _normalize(arr, always, frames, threads):
+    level = peak(arr, frames, threads)
+    if not level or not (always or level > 1):
+        return 1
+
+    gain = 1 / level
+    apply_gain(arr, gain, frames=frames, threads=threads)
+    return gain
+
+
+def _ranges(arr, frames):
+    return blocks.ranges(len(arr), frames)
+
 
+def _min_max(block):
+    return float(block.min()), float(block.max())
 
-def prevent_clipping(arr):
-    _normalize(arr, False)
 
+def _full_scale(dtype):
+    # Return the values of silence and of the lowest and highest samples
+    if not issubclass(dtype.type, np.integer):
+        return 0, -1, 1
 
-def _normalize(arr, always):
-    level = max(np.amax(arr), -np.amin(arr))
-    if always or level > 1:
-        arr.multiply(arr, level, out=arr)
+    ii = np.iinfo(dtype)
+    return (ii.max + 1) // 2 if ii.min == 0 else 0, ii.min, ii.max
 
 
 def _twenty_four_bit(shape, new, raw, itemsize):
@@ -0,0 +1,158 @@
+"""Filter audio with long FIR filters by FFT overlap-add, a block at a time"""
+
+import functools
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from . import blocks, raw
+from .convert import convert
+from .write import DEFAULT_SAMPLE_RATE, WriteMap
+
+MIN_FFT_SIZE = 0x1000
+
+
+class Convolver:
+    """
+    Convolve a stream of blocks of frames with a FIR filter, using FFT
+    overlap-add.
+
+    The filter's spectrum is computed once, and cached between Convolvers
+    with the same filter.  All the channels of a block are transformed
+    together.  The last `len(taps) - 1` frames of each convolution are kept
+    and added to the start of the next one.
+    """
+
+    def __init__(
+        self, taps: np.ndarray, channels: int = 1, fft_size: int | None = None
+    ):
+        """
+        ARGUMENTS
+          taps
+            The filter: either one filter for every channel, or a 2d array
+            with one column for each channel
+
+          channels
+            The number of channels in each frame
+
+          fft_size
+            The size of each FFT, which must be more than `len(taps)`.  If
+            None, it is the first power of two at least `2 * len(taps)`, and
+            at least `MIN_FFT_SIZE`.
+        """
+        taps = np.asarray(taps, np.float64)
+        if taps.ndim == 1:
+            taps = taps[:, None]
+        if not len(taps) or taps.ndim != 2 or taps.shape[1] not in (1, channels):
+            raise ValueError(f"Bad filter shape {taps.shape} for {channels} channels")
+
+        if fft_size is None:
+            fft_size = 1 << (max(2 * len(taps), MIN_FFT_SIZE) - 1).bit_length()
+        if fft_size <= len(taps):
+            raise ValueError(f"fft_size must be more than {len(taps)}")
+
+        self.channels = channels
+        self.fft_size = fft_size
+        self.block_frames = fft_size - len(taps) + 1
+        self.spectrum = _spectrum(taps.tobytes(), taps.shape, fft_size)
+        self.tail = np.zeros((len(taps) - 1, channels))
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Return the filtered frames that line up with `block`"""
+        block = np.asarray(block).reshape(-1, self.channels)
+        result = np.empty(block.shape)
+        for begin, end in blocks.ranges(len(block), self.block_frames):
+            result[begin:end] = self._convolve(block[begin:end])
+        return result
+
+    def flush(self) -> np.ndarray:
+        """Return the last `len(taps) - 1` frames, which ring on after the input"""
+        result, self.tail = self.tail, np.zeros_like(self.tail)
+        return result
+
+    def _convolve(self, block):
+        n, size = len(block), self.fft_size
+        spectrum = np.fft.rfft(block, size, axis=0)
+        spectrum *= self.spectrum
+        y = np.fft.irfft(spectrum, size, axis=0)[: n + len(self.tail)]
+        y[: len(self.tail)] += self.tail
+        self.tail = y[n:].copy()
+        return y[:n]
+
+
+def convolve(
+    arr: np.ndarray,
+    taps: np.ndarray,
+    filename: str | Path | None = None,
+    dtype: np.dtype | None = None,
+    full: bool = False,
+    frames: int = blocks.DEFAULT_FRAMES,
+    fft_size: int | None = None,
+    warn: Callable | None = raw.warn,
+) -> np.ndarray:
+    """
+    Filter an array or `ReadMap` with a FIR filter, one block at a time, and
+    return the result.
+
+    ARGUMENTS
+      arr
+        The audio to filter
+
+      taps
+        The filter: either one filter for every channel, or a 2d array
+        with one column for each channel
+
+      filename
+        If set, the result is written to a new WAVE file with this name and
+        returned as a `WriteMap`.  Otherwise `arr` is filtered in place, which
+        needs a map opened with mode `r+`.
+
+      dtype
+        The type of the samples in the new file.  If None, the type of `arr`
+        is used.
+
+      full
+        If true, the new file is `len(taps) - 1` frames longer than `arr`, to
+        hold the end of the filter's response
+
+      frames
+        The number of frames read in each block
+
+      fft_size
+        Passed to `Convolver`
+
+      warn
+        Passed to `WriteMap`
+    """
+    channels = 1 if arr.ndim == 1 else arr.shape[1]
+    c = Convolver(taps, channels, fft_size)
+
+    if filename is None:
+        if full:
+            raise ValueError("full cannot be set when filtering in place")
+        out = arr
+    else:
+        length = len(arr) + (len(c.tail) if full else 0)
+        shape = (length, *arr.shape[1:])
+        sample_rate = getattr(arr, "sample_rate", None) or DEFAULT_SAMPLE_RATE
+        out = WriteMap(filename, dtype or arr.dtype, shape, sample_rate, warn=warn)
+
+    source = arr.reshape(-1, channels)
+    target = out.reshape(-1, channels)
+    for begin, end in blocks.ranges(len(arr), frames):
+        block = c.process(convert(source[begin:end], np.float64))
+        target[begin:end] = convert(block, out.dtype)
+        blocks.mark_dirty(out, begin, end)
+
+    if len(out) > len(arr):
+        target[len(arr) :] = convert(c.flush(), out.dtype)
+        blocks.mark_dirty(out, len(arr), len(out))
+
+    return out
+
+
+@functools.lru_cache(maxsize=16)
+def _spectrum(data, shape, fft_size):
+    taps = np.frombuffer(data, np.float64).reshape(shape)
+    return np.fft.rfft(taps, fft_size, axis=0)
@@ -0,0 +1,76 @@
+"""Add dither noise to floating point samples before they become integers"""
+
+import numpy as np
+
+from . import blocks
+
+DITHERS = "tpdf", "shaped"
+
+
+class Dither:
+    """
+    Noise of about one least significant bit, added to samples before they are
+    rounded to integers, so rounding errors become noise and not distortion.
+
+    The noise for each block comes from its own generator, seeded from `seed`
+    and the first frame of the block, so results are the same every time and
+    on any number of threads, and no noise array is bigger than a block.
+    """
+
+    def __init__(
+        self,
+        kind: str = "tpdf",
+        seed: int | None = None,
+        frames: int = blocks.DEFAULT_FRAMES,
+    ):
+        """
+        ARGUMENTS
+          kind
+            "tpdf" for plain triangular noise, or "shaped" for triangular
+            noise that is the difference of successive random numbers, which
+            moves the noise into the higher, less audible frequencies
+
+          seed
+            The seed for the random numbers.  If None, a random seed is
+            chosen, and kept for the life of this object.
+
+          frames
+            The number of frames in each block
+        """
+        if kind not in DITHERS:
+            raise ValueError(f"Dither must be one of {DITHERS}, not {kind!r}")
+
+        self.kind = kind
+        self.seed = np.random.SeedSequence().entropy if seed is None else seed
+        self.frames = frames
+
+    def __repr__(self):
+        return f"Dither({self.kind!r}, seed={self.seed}, frames={self.frames})"
+
+    def noise(self, begin: int, shape: tuple, dtype: np.dtype) -> np.ndarray:
+        """Return the noise for a block of the given shape starting at `begin`"""
+        rng = np.random.default_rng([self.seed, begin])
+        first, *rest = shape
+
+        if self.kind == "tpdf":
+            result = rng.random(shape, dtype)
+            result -= rng.random(shape, dtype)
+            return result
+
+        u = rng.random((first + 1, *rest), dtype)
+        return u[1:] - u[:-1]
+
+    def add(self, arr: np.ndarray, start: int = 0) -> np.ndarray:
+        """
+        Add noise in place to a float array whose first frame is frame
+        `start`, one block at a time, and return it
+        """
+        for begin, end in blocks.ranges(len(arr), self.frames):
+            block = arr[begin:end]
+            block += self.noise(start + begin, block.shape, block.dtype)
+        return arr
+
+
+def to_dither(dither: "Dither | str | None") -> Dither | None:
+    """Turn the name of a kind of dither into a `Dither`"""
+    return Dither(dither) if isinstance(dither, str) else dither
@@ -17,6 +17,23 @@ and not `__init__` when deriving from `np.darray`.)
 
 DTYPE = "The numpy datatype of the samples in the file."
 
+DURABILITY = """
+When changes to the `numpy.darray` get written to disk.
+Must be one of `'none'`, `'async'`, `'periodic'` and `'close'`,
+or a number of seconds.
+
+In `'none'`, the default, changes are written when the operating system
+decides to, or when `flush()` is called.
+
+In `'async'`, `flush()` returns at once and writes in the background.
+
+In `'periodic'`, or if a number of seconds is given, changes are also
+written at that regular interval.
+
+In `'close'`, changes are also written when `close()` is called, or at
+the end of a `with` block.
+"""
+
 FILENAME = "The name of the file being mapped"
 
 ORDER = """
@@ -72,6 +89,11 @@ The shape of the resulting numpy.darray. Can be a tuple, or a positive
 integer, or `None`.
 """
 
+TRACK_DIRTY = """
+If `True`, the ranges of frames written through wavemap, rather than
+directly through numpy, are recorded in the `dirty` property.
+"""
+
 WARN = """
 Programmers are sloppy so quite a lot of real-world WAVE files have
 recoverable errors in their format.  `warn` is the function used to
@@ -0,0 +1,143 @@
+"""Move bytes from files to files and sockets in the kernel, without Python buffers"""
+
+import errno
+import os
+import select
+
+COPY_BYTES = 0x1000000
+
+# copy_file_range fails with these if the files or filesystem don't support it
+_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.EBADF,
+    errno.EPERM,
+}
+
+
+def copy_range(
+    src_fd: int, src_offset: int, dst_fd: int, dst_offset: int, count: int
+) -> None:
+    """
+    Copy `count` bytes from one file to another.
+
+    `os.copy_file_range` is tried first, which shares the blocks on a
+    copy-on-write filesystem.  Then comes `os.sendfile`, and last of all, a
+    chunked copy with `os.pread` and `os.pwrite`.
+    """
+    for copy in _copy_file_range, _sendfile:
+        try:
+            done = copy(src_fd, src_offset, dst_fd, dst_offset, count)
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+            done = 0
+
+        src_offset += done
+        dst_offset += done
+        count -= done
+        if not count:
+            return
+
+    _pread_pwrite(src_fd, src_offset, dst_fd, dst_offset, count)
+
+
+def _copy_file_range(src_fd, src_offset, dst_fd, dst_offset, count):
+    if not hasattr(os, "copy_file_range"):
+        return 0
+
+    done = 0
+    while done < count:
+        n = os.copy_file_range(
+            src_fd, dst_fd, count - done, src_offset + done, dst_offset + done
+        )
+        if not n:
+            break
+        done += n
+    return done
+
+
+def _sendfile(src_fd, src_offset, dst_fd, dst_offset, count):
+    if not hasattr(os, "sendfile"):
+        return 0
+
+    os.lseek(dst_fd, dst_offset, os.SEEK_SET)
+    done = 0
+    while done < count:
+        n = os.sendfile(dst_fd, src_fd, src_offset + done, count - done)
+        if not n:
+            break
+        done += n
+    return done
+
+
+def _pread_pwrite(src_fd, src_offset, dst_fd, dst_offset, count):
+    while count:
+        b = os.pread(src_fd, min(count, COPY_BYTES), src_offset)
+        if not b:
+            raise ValueError(f"Source file ended with {count} bytes left to copy")
+        n = os.pwrite(dst_fd, b, dst_offset)
+        src_offset += n
+        dst_offset += n
+        count -= n
+
+
+def send_range(out_fd: int, in_fd: int, offset: int, count: int) -> int:
+    """
+    Send `count` bytes starting at `offset` in a file to a socket, pipe or
+    file with `os.sendfile`, and return how many bytes were sent, which is
+    less than `count` only if `os.sendfile` is not supported.
+    """
+    done = 0
+    while done < count:
+        try:
+            n = os.sendfile(out_fd, in_fd, offset + done, count - done)
+        except BlockingIOError:
+            wait_writable(out_fd)
+            continue
+        except (AttributeError, OSError) as e:
+            if getattr(e, "errno", errno.ENOSYS) not in _UNSUPPORTED or done:
+                raise
+            break
+        if not n:
+            raise ValueError(f"File ended with {count - done} bytes left to send")
+        done += n
+
+    return done
+
+
+def write_all(fd: int, data) -> None:
+    """Write all of a bytes-like object to a file descriptor"""
+    data = memoryview(data).cast("B")
+    while data:
+        try:
+            data = data[os.write(fd, data) :]
+        except BlockingIOError:
+            wait_writable(fd)
+
+
+def writev_all(fd: int, buffers: list, max_buffers: int = 1024) -> None:
+    """
+    Write all of a list of bytes-like objects to a file descriptor, as few
+    at a time as `os.writev` allows
+    """
+    buffers = [memoryview(b).cast("B") for b in buffers]
+    i = 0
+    while i < len(buffers):
+        try:
+            written = os.writev(fd, buffers[i : i + max_buffers])
+        except BlockingIOError:
+            wait_writable(fd)
+            continue
+
+        while i < len(buffers) and written >= len(buffers[i]):
+            written -= len(buffers[i])
+            i += 1
+        if written:
+            buffers[i] = buffers[i][written:]
+
+
+def wait_writable(fd: int) -> None:
+    select.select([], [fd], [])
@@ -0,0 +1,175 @@
+"""Mix many sources into one array, a block at a time"""
+
+import math
+import threading
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from . import blocks, raw
+from .convert import convert
+from .read import ReadMap
+
+MIX_DTYPE = np.dtype("float32")
+
+
+class Source(NamedTuple):
+    """One input to `mix()`"""
+
+    array: np.ndarray | str | Path
+    gain: float = 1
+    offset: int = 0  # The frame of the output where this source starts
+    pan: float | None = None  # From -1 (left) to 1 (right), for mono sources
+
+
+def mix(
+    sources: Sequence[Source | np.ndarray | str | Path],
+    out: np.ndarray,
+    frames: int = blocks.DEFAULT_FRAMES,
+    threads: int = 1,
+    prevent_clipping: bool = True,
+    warn: Callable | None = raw.warn,
+) -> float:
+    """
+    Mix audio sources into `out`, usually a `WriteMap`, and return the gain
+    that was applied to the whole mix to prevent clipping.
+
+    The mix is summed in a `float32` buffer of `frames` frames and converted
+    to the type of `out` one block at a time, so no temporary is ever the size
+    of the output.
+
+    ARGUMENTS
+      sources
+        A sequence of `Source`, or of arrays or file names to mix in at
+        full gain.  Each source must either have as many channels as `out`, or
+        be mono, in which case it is sent to every channel of `out`, or panned
+        if `out` is stereo.  Frames past the end of `out` are dropped.
+
+      out
+        The array to write the mix into
+
+      frames
+        The number of frames in each block
+
+      threads
+        If more than one, blocks are mixed in parallel by this many threads
+
+      prevent_clipping
+        If true, the sources are read twice: first to find the peak of the
+        mix, and then to write the mix, scaled down if the peak is above 1
+
+      warn
+        Passed to `ReadMap` for each file name
+    """
+    mixer = _Mixer(sources, out, frames, warn)
+    ranges = list(blocks.ranges(len(out), frames))
+
+    gain = 1
+    if prevent_clipping:
+        peak = max(blocks.map_ranges(mixer.peak, ranges, threads), default=0)
+        if peak > 1:
+            gain = 1 / peak
+
+    for _ in blocks.map_ranges(lambda b, e: mixer.write(b, e, gain), ranges, threads):
+        pass
+
+    return gain
+
+
+class _Input(NamedTuple):
+    array: np.ndarray  # Always 2d
+    weights: np.ndarray  # The gain of each output channel
+    offset: int
+    scale: float  # The conversion of the samples to the range [-1, 1]
+    shift: float
+
+
+class _Mixer:
+    def __init__(self, sources, out, frames, warn):
+        self.out = out
+        self.channels = 1 if out.ndim == 1 else out.shape[1]
+        self.frames = frames
+        self.inputs = [self._input(s, warn) for s in sources]
+        self.local = threading.local()
+
+    def peak(self, begin, end):
+        mixed = self.mix(begin, end)
+        return float(max(mixed.max(), -mixed.min()))
+
+    def write(self, begin, end, gain):
+        mixed = self.mix(begin, end)
+        if gain != 1:
+            mixed *= gain
+        block = convert(mixed if self.out.ndim == 2 else mixed[:, 0], self.out.dtype)
+        blocks.write(self.out, block, begin)
+
+    def mix(self, begin, end):
+        result, samples, scaled = self._buffers()
+        result = result[: end - begin]
+        result.fill(0)
+
+        for i in self.inputs:
+            b, e = max(begin, i.offset), min(end, i.offset + len(i.array))
+            if b < e:
+                s = samples[: e - b, : i.array.shape[1]]
+                s[:] = i.array[b - i.offset : e - i.offset]
+                if i.scale != 1:
+                    s *= i.scale
+                if i.shift:
+                    s -= i.shift
+                np.multiply(s, i.weights, out=scaled[: e - b])
+                result[b - begin : e - begin] += scaled[: e - b]
+
+        return result
+
+    def _buffers(self):
+        # Each thread mixes into its own buffers, which are reused for every
+        # block that thread mixes
+        if not hasattr(self.local, "buffers"):
+            width = max((i.array.shape[1] for i in self.inputs), default=1)
+            shapes = (self.channels, width, self.channels)
+            self.local.buffers = [np.empty((self.frames, c), MIX_DTYPE) for c in shapes]
+        return self.local.buffers
+
+    def _input(self, source, warn):
+        if not isinstance(source, Source):
+            source = Source(source)
+
+        arr = source.array
+        if isinstance(arr, (str, Path)):
+            arr = ReadMap(arr, always_2d=True, warn=warn)
+        elif arr.ndim == 1:
+            arr = arr[:, None]
+
+        if source.offset < 0:
+            raise ValueError(f"Source offset cannot be negative: {source.offset}")
+
+        rates = (
+            getattr(arr, "sample_rate", None),
+            getattr(self.out, "sample_rate", None),
+        )
+        if all(rates) and rates[0] != rates[1]:
+            raise ValueError(f"Different sample rates: {rates[0]} != {rates[1]}")
+
+        channels = arr.shape[1]
+        if source.pan is not None:
+            if channels != 1 or self.channels != 2:
+                raise ValueError("Only mono sources can be panned into stereo")
+            angle = (source.pan + 1) * math.pi / 4
+            weights = [math.cos(angle), math.sin(angle)]
+        elif channels in (1, self.channels):
+            weights = [1] * self.channels
+        else:
+            raise ValueError(f"Cannot mix {channels} channels into {self.channels}")
+
+        weights = source.gain * np.array(weights, MIX_DTYPE)
+        if issubclass(arr.dtype.type, np.integer):
+            ii = np.iinfo(arr.dtype)
+            scale = 2 / (ii.max - ii.min)
+            shift = (ii.max + ii.min) / (ii.max - ii.min)
+        else:
+            scale, shift = 1, 0
+
+        return _Input(arr, weights, source.offset, scale, shift)
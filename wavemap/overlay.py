@@ -0,0 +1,230 @@
+"""
+Stage edits to a WAVE file in a sparse delta file, without touching the
+original until `commit()` is called
+"""
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from . import blocks, raw
+from .ranges import Ranges
+from .read import ReadMap
+from .sidecar import stamp
+from .structure.structure import INT32, INT64, Structure
+
+DEFAULT_BLOCK_FRAMES = 0x1000
+DELTA_SUFFIX = ".delta"
+MAGIC = b"WMDL"
+
+HEADER = Structure(
+    magic="4s",
+    blockFrames=INT32,
+    frameBytes=INT32,
+    sourceSize=INT64,
+    sourceMtime=INT64,
+)
+RECORD = Structure(block=INT32)
+
+
+class Overlay:
+    """
+    A read-only WAVE file with a layer of edits kept in a delta file.
+
+    Reading returns the original samples with the edits applied.  Writing
+    stores whole blocks of frames in the delta file, so only the blocks that
+    were changed take up space on disk or in memory.  The delta file
+    persists between sessions until `commit()` or `discard()` is called,
+    but only applies to the original while its size and modification time
+    are the same as when the delta file was started.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        delta: str | None = None,
+        block_frames: int = DEFAULT_BLOCK_FRAMES,
+        always_2d: bool = False,
+        warn: Callable | None = raw.warn,
+    ):
+        if block_frames <= 0:
+            raise ValueError(f"block_frames must be positive: {block_frames}")
+
+        self.original = ReadMap(filename, always_2d=always_2d, warn=warn)
+        self.filename = Path(filename)
+        self.delta = Path(delta or str(filename) + DELTA_SUFFIX)
+        self.block_frames = block_frames
+        self.frame_bytes = self.original._frame_bytes
+        self._blocks = {}
+        self._fd = None
+
+        if self.delta.exists():
+            self._open()
+            self._read_index()
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.original.dtype
+
+    @property
+    def shape(self) -> tuple:
+        return self.original.shape
+
+    @property
+    def sample_rate(self) -> int:
+        return self.original.sample_rate
+
+    @property
+    def modified(self) -> Ranges:
+        """The ranges of frames that have been written"""
+        bf, n = self.block_frames, len(self)
+        return Ranges((k * bf, min(n, (k + 1) * bf)) for k in self._blocks)
+
+    def __len__(self) -> int:
+        return len(self.original)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __array__(self, dtype=None):
+        return self.read(0, len(self)).astype(dtype or self.dtype, copy=False)
+
+    def __getitem__(self, key):
+        start, stop, local, rest = blocks.split_key(key, len(self), "Overlay")
+        return self.read(start, stop)[(local, *rest)]
+
+    def __setitem__(self, key, value):
+        start, stop, local, rest = blocks.split_key(key, len(self), "Overlay")
+        block = self.read(start, stop)
+        block[(local, *rest)] = value
+        self.write(block, start)
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Return a copy of frames `[start, stop)` with the edits applied"""
+        result = np.array(self.original[start:stop])
+        for k, begin, end in self._overlapping(start, stop):
+            if k in self._blocks:
+                offset = k * self.block_frames
+                data = self._read_block(k)[begin - offset : end - offset]
+                result[begin - start : end - start] = data
+        return result
+
+    def write(self, block: np.ndarray, start: int = 0) -> int:
+        """
+        Write `block` starting at frame `start`, and return the frame after
+        the end of the block
+        """
+        stop = start + len(block)
+        if start < 0 or stop > len(self):
+            raise IndexError(f"Frames [{start}, {stop}) out of range")
+
+        for k, begin, end in self._overlapping(start, stop):
+            offset = k * self.block_frames
+            part = block[begin - start : end - start]
+            if end - begin == self._block_shape(k)[0]:
+                data = part
+            else:
+                data = self._read_block(k)
+                data[begin - offset : end - offset] = part
+            self._write_block(k, np.asarray(data, self.dtype))
+
+        return stop
+
+    def commit(self):
+        """Write only the changed blocks into the original file"""
+        if self._blocks:
+            fd = os.open(self.filename, os.O_WRONLY)
+            try:
+                for k in sorted(self._blocks):
+                    offset = k * self.block_frames * self.frame_bytes
+                    data = self._read_block(k).tobytes()
+                    os.pwrite(fd, data, self.original.offset + offset)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        self.discard()
+
+    def discard(self):
+        """Throw away all the edits and delete the delta file"""
+        self.close()
+        self._blocks.clear()
+        self.delta.unlink(missing_ok=True)
+
+    def close(self):
+        """Close the delta file, keeping the edits in it for later"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _overlapping(self, start, stop):
+        # Yield each block that overlaps [start, stop), with the overlap
+        bf = self.block_frames
+        for k in range(start // bf, -(-stop // bf)):
+            yield k, max(start, k * bf), min(stop, (k + 1) * bf)
+
+    def _block_shape(self, k):
+        frames = min(self.block_frames, len(self) - k * self.block_frames)
+        return (frames, *self.shape[1:])
+
+    def _read_block(self, k):
+        shape = self._block_shape(k)
+        position = self._blocks.get(k)
+        if position is None:
+            bf = self.block_frames
+            return np.array(self.original[k * bf : k * bf + shape[0]])
+
+        size = shape[0] * self.frame_bytes
+        data = os.pread(self._fd, size, position)
+        return np.frombuffer(data, self.dtype).reshape(shape).copy()
+
+    def _write_block(self, k, data):
+        if self._fd is None:
+            self._open()
+
+        position = self._blocks.get(k)
+        if position is None:
+            end = os.lseek(self._fd, 0, os.SEEK_END)
+            os.pwrite(self._fd, RECORD.pack(block=k), end)
+            position = self._blocks[k] = end + RECORD.size
+
+        os.pwrite(self._fd, data.tobytes(), position)
+
+    def _open(self):
+        exists = self.delta.exists()
+        self._fd = os.open(self.delta, os.O_RDWR | os.O_CREAT, 0o644)
+        if not exists:
+            size, mtime = stamp(self.filename)
+            header = HEADER.pack(
+                magic=MAGIC,
+                blockFrames=self.block_frames,
+                frameBytes=self.frame_bytes,
+                sourceSize=size,
+                sourceMtime=mtime,
+            )
+            os.pwrite(self._fd, header, 0)
+
+    def _read_index(self):
+        h = HEADER.unpack_from(os.pread(self._fd, HEADER.size, 0))
+        if h.magic != MAGIC:
+            raise ValueError(f"{self.delta} is not a delta file")
+
+        if h.frameBytes != self.frame_bytes:
+            raise ValueError(f"{self.delta} does not match {self.filename}")
+
+        if (h.sourceSize, h.sourceMtime) != stamp(self.filename):
+            raise ValueError(f"{self.filename} changed after {self.delta} was made")
+
+        self.block_frames = h.blockFrames
+
+        position = HEADER.size
+        size = os.lseek(self._fd, 0, os.SEEK_END)
+        while position + RECORD.size <= size:
+            k = RECORD.unpack_from(os.pread(self._fd, RECORD.size, position)).block
+            self._blocks[k] = position + RECORD.size
+            position += RECORD.size + self._block_shape(k)[0] * self.frame_bytes
@@ -0,0 +1,197 @@
+"""
+A pyramid of the minimum, maximum and RMS level of a WAVE file at every
+power of two zoom, for drawing waveforms
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from . import blocks, raw
+from .convert import _full_scale
+from .read import ReadMap
+from .sidecar import Sidecar
+from .structure.structure import INT32, Structure
+
+DEFAULT_DECIMATION = 0x100
+MAGIC = b"WMOV"
+SUFFIX = ".overview"
+
+HEADER = Structure(decimation=INT32, channels=INT32, dtype="8s")
+
+
+class Overview:
+    """
+    The minimum, maximum and RMS of each channel of a WAVE file, over every
+    `decimation * 2 ** k` frames, for each level `k` until one entry covers
+    the whole file.  The RMS is measured from silence, so it is not thrown
+    off by the offset of unsigned 8 bit samples.
+
+    The pyramid is built in one blocked pass over the file and kept in a
+    memory-mapped sidecar file, which is rebuilt when the WAVE file changes
+    size or modification time.  `query()` answers any zoom in time
+    proportional to the number of pixels.
+    """
+
+    def __init__(
+        self,
+        filename: str | Path,
+        decimation: int = DEFAULT_DECIMATION,
+        threads: int = 1,
+        warn: Callable | None = raw.warn,
+    ):
+        """
+        ARGUMENTS
+          filename
+            The WAVE file to summarize
+
+          decimation
+            The number of frames covered by each entry of the finest level,
+            which must be a power of two
+
+          threads
+            If more than one, the pyramid is built by this many threads
+
+          warn
+            Passed to `ReadMap`
+        """
+        if decimation <= 0 or decimation & (decimation - 1):
+            raise ValueError(f"decimation must be a power of two: {decimation}")
+
+        self.source = ReadMap(filename, always_2d=True, warn=warn)
+        self.decimation = decimation
+        self.dtype = _record(self.source.dtype)
+        self.sidecar = Sidecar(filename, SUFFIX, MAGIC)
+
+        body = self.sidecar.load()
+        if body is None or bytes(body[: HEADER.size]) != self._header():
+            body = self.sidecar.write(self._size(), lambda b: self._build(b, threads))
+        self.levels = self._levels(body)
+
+    @property
+    def channels(self) -> int:
+        return self.source.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def query(self, start: int, stop: int, pixels: int) -> np.ndarray:
+        """
+        Return an array of `pixels` records of `min`, `max` and `rms` for
+        each channel, each covering an equal share of frames `[start, stop)`.
+
+        The level used is the coarsest one with entries no longer than a
+        pixel, so each pixel combines at most a few entries.  Frames at the
+        edges of a pixel are rounded out to whole entries.
+        """
+        if not 0 <= start < stop <= len(self):
+            raise ValueError(f"Bad frame range [{start}, {stop})")
+        if pixels <= 0:
+            raise ValueError(f"pixels must be positive: {pixels}")
+
+        edges = np.linspace(start, stop, pixels + 1).astype(np.int64)
+        per_pixel = (stop - start) / pixels
+        if per_pixel < self.decimation:
+            block = self.source[start:stop]
+            return _reduce(
+                block, block, self._centered(block), None, edges[:-1] - start
+            )
+
+        k = min(int(np.log2(per_pixel / self.decimation)), len(self.levels) - 1)
+        size = self.decimation << k
+        first, end = start // size, -(-stop // size)
+        level = self.levels[k][first:end]
+        counts = self._counts(k)[first:end]
+        return _reduce(
+            level["min"], level["max"], level["rms"], counts, edges[:-1] // size - first
+        )
+
+    def _build(self, body, threads):
+        body[: HEADER.size] = np.frombuffer(self._header(), np.uint8)
+        levels = self._levels(body)
+        if not levels:
+            return
+
+        d = self.decimation
+        frames = max(d, blocks.DEFAULT_FRAMES // d * d)
+
+        def summarize(begin, end):
+            block = self.source[begin:end]
+            starts = np.arange(0, len(block), d)
+            levels[0][begin // d : -(-end // d)] = _reduce(
+                block, block, self._centered(block), None, starts
+            )
+
+        for _ in blocks.map_ranges(
+            summarize, blocks.ranges(len(self), frames), threads
+        ):
+            pass
+
+        for k in range(1, len(levels)):
+            prev = levels[k - 1]
+            starts = np.arange(0, len(prev), 2)
+            levels[k][:] = _reduce(
+                prev["min"], prev["max"], prev["rms"], self._counts(k - 1), starts
+            )
+
+    def _centered(self, block):
+        # The samples measured from silence, for computing the RMS
+        center, _, _ = _full_scale(block.dtype)
+        return block.astype(np.float64) - center if center else block
+
+    def _counts(self, k):
+        # The number of frames covered by each entry of level k
+        size = self.decimation << k
+        counts = np.full(self._lengths()[k], size, np.int64)
+        counts[-1] = len(self) - size * (len(counts) - 1)
+        return counts
+
+    def _header(self):
+        return HEADER.pack(
+            decimation=self.decimation,
+            channels=self.channels,
+            dtype=self.source.dtype.str.encode(),
+        )
+
+    def _lengths(self):
+        lengths, n = [], -(-len(self) // self.decimation)
+        while n:
+            lengths.append(n)
+            n = 0 if n == 1 else -(-n // 2)
+        return lengths
+
+    def _size(self):
+        return HEADER.size + sum(self._lengths()) * self.channels * self.dtype.itemsize
+
+    def _levels(self, body):
+        result, offset = [], HEADER.size
+        for n in self._lengths():
+            size = n * self.channels * self.dtype.itemsize
+            data = body[offset : offset + size].view(self.dtype)
+            result.append(data.reshape(n, self.channels))
+            offset += size
+        return result
+
+
+def _reduce(mins, maxes, rms, counts, starts):
+    # Combine runs of entries that begin at `starts` into one record each.
+    # RMS values are weighted by `counts`, the number of frames in each entry,
+    # which is None if each entry is a single frame.
+    result = np.empty((len(starts), mins.shape[1]), _record(mins.dtype))
+    result["min"] = np.minimum.reduceat(mins, starts, axis=0)
+    result["max"] = np.maximum.reduceat(maxes, starts, axis=0)
+
+    squares = np.square(rms, dtype=np.float64)
+    if counts is None:
+        frames = np.maximum(np.diff(starts, append=len(rms)), 1)
+    else:
+        squares *= counts[:, None]
+        frames = np.add.reduceat(counts, starts)
+    total = np.add.reduceat(squares, starts, axis=0)
+    result["rms"] = np.sqrt(total / frames[:, None])
+    return result
+
+
+def _record(dtype):
+    return np.dtype([("min", dtype), ("max", dtype), ("rms", "f4")])
@@ -0,0 +1,213 @@
+"""Convert between interleaved WAVE files and separate channels"""
+
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from pathlib import Path
+
+import numpy as np
+
+from . import blocks, raw
+from .convert import convert
+from .read import ReadMap
+from .sidecar import Sidecar
+from .structure.structure import INT32, Structure
+from .write import WriteMap
+
+CACHE_BYTES = 0x40000  # The size of the interleaved data in each block
+MAGIC = b"WMPL"
+SUFFIX = ".planar"
+
+HEADER = Structure(channels=INT32, dtype="8s")
+PLANE_ALIGNMENT = 64
+
+
+class PlanarCache:
+    """
+    A WAVE file, with a copy of its samples stored one channel after another
+    in a memory-mapped sidecar file.
+
+    Reading one channel of an interleaved file touches every page of the
+    file, but reading one channel from the cache only touches that channel's
+    pages.  The cache is built in one pass over the file, and rebuilt when
+    the file changes size or modification time.
+    """
+
+    def __init__(
+        self,
+        filename: str | Path,
+        threads: int = 1,
+        warn: Callable | None = raw.warn,
+    ):
+        """
+        ARGUMENTS
+          filename
+            The WAVE file to cache
+
+          threads
+            If more than one, the cache is built by this many threads
+
+          warn
+            Passed to `ReadMap`
+        """
+        self.source = ReadMap(filename, always_2d=True, warn=warn)
+        self.sidecar = Sidecar(filename, SUFFIX, MAGIC)
+
+        body = self.sidecar.load()
+        if body is None or bytes(body[: HEADER.size]) != self._header():
+            size = self._offset() + self.source.nbytes
+            body = self.sidecar.write(size, lambda b: self._build(b, threads))
+        self.planes = self._planes(body)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.source.dtype
+
+    @property
+    def shape(self) -> tuple:
+        return self.source.shape
+
+    @property
+    def ndim(self) -> int:
+        return 2
+
+    @property
+    def sample_rate(self) -> int:
+        return self.source.sample_rate
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def __array__(self, dtype=None):
+        return np.asarray(self.source, dtype)
+
+    def __getitem__(self, key):
+        """
+        Index the file like a `ReadMap`.  Indexes that select a single channel
+        read from that channel's plane in the cache.
+        """
+        if isinstance(key, tuple) and len(key) == 2:
+            frames, channel = key
+            if isinstance(channel, (int, np.integer)):
+                return self.channel(channel)[frames]
+        return self.source[key]
+
+    def channel(self, index: int) -> np.ndarray:
+        """Return one channel as a contiguous, read-only array"""
+        return self.planes[index]
+
+    def _build(self, body, threads):
+        body[: HEADER.size] = np.frombuffer(self._header(), np.uint8)
+        planes = self._planes(body)
+
+        # Transpose a block of frames small enough to stay in the cache
+        frames = max(1, CACHE_BYTES // (self.dtype.itemsize * self.shape[1]))
+
+        def transpose(begin, end):
+            planes[:, begin:end] = self.source[begin:end].T
+
+        for _ in blocks.map_ranges(
+            transpose, blocks.ranges(len(self), frames), threads
+        ):
+            pass
+
+    def _header(self):
+        return HEADER.pack(channels=self.shape[1], dtype=self.dtype.str.encode())
+
+    def _offset(self):
+        # The planes come after the header, padded so the samples are aligned
+        return -(-HEADER.size // PLANE_ALIGNMENT) * PLANE_ALIGNMENT
+
+    def _planes(self, body):
+        data = body[self._offset() : self._offset() + self.source.nbytes]
+        return data.view(self.dtype).reshape(self.shape[1], len(self))
+
+
+def write_planar(
+    channels: Sequence[np.ndarray | Iterable[np.ndarray]],
+    filename: str | Path,
+    sample_rate: int,
+    dtype: np.dtype | None = None,
+    length: int | None = None,
+    warn: Callable | None = raw.warn,
+) -> WriteMap:
+    """
+    Interleave separate channels into a new WAVE file, and return a
+    `WriteMap` of it.
+
+    Each block of frames is interleaved in a small buffer that stays in the
+    CPU cache, and then written to the file in order, so memory use is one
+    block per channel, however long the file is.
+
+    ARGUMENTS
+      channels
+        One entry for each channel: either a 1d array, or an iterable of
+        1d blocks of any size, like the output of a generator
+
+      filename
+        The name of the new WAVE file
+
+      sample_rate
+        The sample rate of the new file
+
+      dtype
+        The type of the samples in the new file.  If None, the type of the
+        first channel is used, which must then be an array.
+
+      length
+        The number of frames in each channel.  If None, the length of the
+        first channel is used, which must then be an array.
+
+      warn
+        Passed to `WriteMap`
+    """
+    if not channels:
+        raise ValueError("write_planar needs at least one channel")
+
+    first = channels[0]
+    dtype = dtype or getattr(first, "dtype", None)
+    if length is None and hasattr(first, "__len__"):
+        length = len(first)
+    if dtype is None or length is None:
+        raise ValueError("dtype and length must be set for iterators")
+
+    count = len(channels)
+    out = WriteMap(filename, dtype, (length, count), sample_rate, warn=warn)
+    frames = max(1, CACHE_BYTES // (out.itemsize * count))
+    sources = [_rechunk(c, frames) for c in channels]
+    buffer = np.empty((frames, count), out.dtype)
+
+    for begin, end in blocks.ranges(length, frames):
+        for i, source in enumerate(sources):
+            block = next(source, None)
+            if block is None or len(block) != end - begin:
+                raise ValueError(f"Channel {i} is shorter than {length} frames")
+            buffer[: end - begin, i] = convert(block, out.dtype)
+
+        blocks.write(out, buffer[: end - begin], begin)
+
+    for i, source in enumerate(sources):
+        if next(source, None) is not None:
+            raise ValueError(f"Channel {i} is longer than {length} frames")
+
+    return out
+
+
+def _rechunk(channel, frames) -> Iterator[np.ndarray]:
+    # Yield blocks of exactly `frames` frames from an array or from an
+    # iterable of blocks of any size, except that the last may be shorter
+    if isinstance(channel, np.ndarray):
+        yield from blocks.blocks(channel, frames)
+        return
+
+    pending, size = [], 0
+    for block in channel:
+        pending.append(np.asarray(block))
+        size += len(block)
+        if size >= frames:
+            joined = np.concatenate(pending)
+            for begin in range(0, size - frames + 1, frames):
+                yield joined[begin : begin + frames]
+            rest = joined[size - size % frames :]
+            pending, size = [rest], len(rest)
+
+    if size:
+        yield np.concatenate(pending)
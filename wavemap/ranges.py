@@ -0,0 +1,69 @@
+import bisect
+import threading
+from collections.abc import Iterable, Iterator
+
+
+class Ranges:
+    """A sorted set of disjoint half-open ranges of frames"""
+
+    def __init__(self, ranges: Iterable[tuple[int, int]] = ()):
+        self._starts: list[int] = []
+        self._stops: list[int] = []
+        self._lock = threading.Lock()
+        for start, stop in ranges:
+            self.add(start, stop)
+
+    def add(self, start: int, stop: int):
+        """Add the range `[start, stop)`, merging any ranges it touches"""
+        if start >= stop:
+            return
+
+        with self._lock:
+            lo = bisect.bisect_left(self._stops, start)
+            hi = bisect.bisect_right(self._starts, stop)
+            if lo < hi:
+                start = min(start, self._starts[lo])
+                stop = max(stop, self._stops[hi - 1])
+            self._starts[lo:hi] = [start]
+            self._stops[lo:hi] = [stop]
+
+    def clear(self):
+        with self._lock:
+            self._starts.clear()
+            self._stops.clear()
+
+    def shift(self, delta: int) -> "Ranges":
+        """Return a copy with every range moved by `delta` frames"""
+        return __class__((a + delta, b + delta) for a, b in self)
+
+    def overlapping(self, start: int, stop: int) -> Iterator[tuple[int, int]]:
+        """Yield the part of each range that lies inside `[start, stop)`"""
+        with self._lock:
+            lo = bisect.bisect_right(self._stops, start)
+            hi = bisect.bisect_left(self._starts, stop)
+            pairs = list(zip(self._starts[lo:hi], self._stops[lo:hi]))
+
+        for a, b in pairs:
+            yield max(a, start), min(b, stop)
+
+    @property
+    def frames(self) -> int:
+        """The total number of frames in all the ranges"""
+        return sum(b - a for a, b in self)
+
+    def __contains__(self, frame: int) -> bool:
+        i = bisect.bisect_right(self._starts, frame)
+        return bool(i) and frame < self._stops[i - 1]
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        with self._lock:
+            return iter(list(zip(self._starts, self._stops)))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"{__class__.__name__}({list(self)})"
@@ -1,14 +1,27 @@
+import mmap
 import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Union
 from collections.abc import Callable
 
 import numpy as np
 
 from . import docs
+from .convert import apply_gain
 from .memmap import memmap
+from .ranges import Ranges
 
 int24 = "int24"
 
+DURABILITY = "none", "async", "periodic", "close"
+PERIODIC_SECONDS = 5
+
+# Attributes that a view shares with the RawMap it was taken from
+_SHARED = "_dirty", "_frame_bytes", "_sync", "sample_rate"
+_FLUSH_EXECUTOR = None
+
 
 def warn(msg):
     print(msg, file=sys.stderr)
@@ -28,15 +41,22 @@ class RawMap(memmap):
         roffset: int = 0,
         order: str | None = None,
         always_2d: bool = False,
+        durability: str | float = "none",
+        track_dirty: bool = False,
         warn: Callable | None = warn,
     ):
         """Memory map raw audio data from a disk file into a numpy matrix"""
         # Documentation for parameters is in docs.py
 
         def new(shape=shape, dtype=dtype, order=order, mode=mode):
-            return memmap.__new__(
+            self = memmap.__new__(
                 cls, filename, dtype, mode, offset, shape, order, roffset
             )
+            channels = 1 if self.ndim == 1 else self.shape[order != "F"]
+            self._frame_bytes = self.itemsize * channels
+            self._sync = _Sync(self._mmap, durability)
+            self._dirty = Ranges() if track_dirty else None
+            return self
 
         if offset < 0 or roffset < 0:
             raise ValueError("offset and roffset must be non-negative")
@@ -68,6 +88,214 @@ class RawMap(memmap):
             raise ValueError("Cannot memory map 24-bit audio")
         return new(shape=shape)
 
+    def __array_finalize__(self, obj):
+        super().__array_finalize__(obj)
+        is_view = self._mmap is not None
+        for name in _SHARED:
+            setattr(self, name, getattr(obj, name, None) if is_view else None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __imul__(self, other):
+        # numpy would wrap integer samples around, or refuse to scale them by
+        # a float in place, so apply_gain() rounds and saturates them instead
+        if _is_gain(self, other):
+            return apply_gain(self, other)
+        return super().__imul__(other)
+
+    def __itruediv__(self, other):
+        if _is_gain(self, other):
+            return apply_gain(self, 1 / other)
+        return super().__itruediv__(other)
+
+    @property
+    def durability(self) -> str | None:
+        return self._sync and self._sync.policy
+
+    @property
+    def dirty(self) -> Ranges | None:
+        """
+        The ranges of frames of the whole map changed through wavemap, or
+        `None` if changes are not being tracked
+        """
+        return self._dirty
+
+    def mark_dirty(self, start: int, stop: int):
+        """Record that frames `[start, stop)` of this array were changed"""
+        if self._dirty is not None:
+            offset = self._frame_offset()
+            self._dirty.add(start + offset, stop + offset)
+
+    def flush(self, frames: tuple | None = None):
+        """
+        Write changes to the file on disk.
+
+        If `frames` is a `(start, stop)` pair, only the pages holding those
+        frames of this array are written.  With `durability="async"`, the
+        write happens in the background and a `Future` is returned.
+        """
+        if not self._sync:
+            return
+
+        if frames is None:
+            return self._sync.flush()
+
+        start, stop, _ = slice(*frames).indices(self._frame_count())
+        if start >= stop:
+            return
+
+        begin, end = self._mmap_position(start), self._mmap_position(stop)
+        begin -= begin % mmap.PAGESIZE
+        end = min(end, len(self._mmap))
+        return self._sync.flush(begin, end - begin)
+
+    def flush_dirty(self):
+        """Write only the dirty frames to disk, and then forget them"""
+        if not (self._sync and self._dirty):
+            return
+
+        start = self.offset - self.offset % mmap.ALLOCATIONGRANULARITY
+        data = self.offset - start
+        for a, b in self._dirty:
+            begin = data + a * self._frame_bytes
+            begin -= begin % mmap.PAGESIZE
+            end = min(data + b * self._frame_bytes, len(self._mmap))
+            self._sync.flush(begin, end - begin)
+
+        self._dirty.clear()
+
+    def close(self):
+        """
+        Apply the durability policy at the end of writing.
+
+        Pending background writes are waited for, periodic flushing stops,
+        and unless `durability="none"`, the whole map is flushed.  The
+        memory map itself is released when the array is garbage collected.
+        """
+        if self._sync:
+            self._sync.close()
+
+    def _frame_offset(self) -> int:
+        # The frame in the mapped data where this array or view begins
+        start = self.offset - self.offset % mmap.ALLOCATIONGRANULARITY
+        data = _address(self._mmap) + self.offset - start
+        return (self.ctypes.data - data) // self._frame_bytes
+
+    def _frame_count(self) -> int:
+        # The number of frames in this array or view, whichever axis holds them
+        for axis, stride in enumerate(self.strides):
+            if stride == self._frame_bytes:
+                return self.shape[axis]
+
+        # Some of the channels of a single frame
+        one_frame = self.ndim == 1 and self.nbytes <= self._frame_bytes
+        if one_frame and self.strides[0] == self.itemsize:
+            return 1
+
+        raise ValueError(f"Cannot find frames in strides {self.strides}")
+
+    def _mmap_position(self, frame: int) -> int:
+        # The position in the memory map of a frame of this array or view
+        delta = self.ctypes.data - _address(self._mmap)
+        return delta + frame * self._frame_bytes
+
+    def _file_position(self, frame: int = 0) -> int:
+        # The position in the file of a frame of this array or view
+        start = self.offset - self.offset % mmap.ALLOCATIONGRANULARITY
+        return start + self._mmap_position(frame)
+
+    def _is_frames(self) -> bool:
+        # True if this is contiguous whole frames, laid out as in the file
+        if self._mmap is None or not self.flags.c_contiguous:
+            return False
+        if self.ndim == 1:
+            return self.itemsize == self._frame_bytes
+        return self.shape[1] * self.itemsize == self._frame_bytes
+
+
+class _Sync:
+    """Flush a memory map according to a durability policy"""
+
+    def __init__(self, mm, policy: str | float):
+        self.policy = policy
+        self.pending = []
+        self.stopped = threading.Event()
+        self._mmap = weakref.ref(mm)
+
+        if isinstance(policy, (int, float)) and not isinstance(policy, bool):
+            if policy <= 0:
+                raise ValueError(f"Periodic flush needs a positive time: {policy}")
+            self.policy, interval = "periodic", policy
+        elif policy == "periodic":
+            interval = PERIODIC_SECONDS
+        elif policy in DURABILITY:
+            return
+        else:
+            raise ValueError(f"durability {policy} not in {DURABILITY}")
+
+        target = _flush_periodically
+        args = self._mmap, self.stopped, interval
+        threading.Thread(target=target, args=args, daemon=True).start()
+
+    def __bool__(self):
+        return self._mmap() is not None
+
+    def flush(self, offset: int = 0, size: int = 0):
+        mm = self._mmap()
+        if mm is None or mm.closed:
+            return
+
+        if self.policy != "async":
+            return _flush(mm, offset, size)
+
+        global _FLUSH_EXECUTOR
+        if _FLUSH_EXECUTOR is None:
+            _FLUSH_EXECUTOR = ThreadPoolExecutor(1, "wavemap-flush")
+
+        self.pending = [f for f in self.pending if not f.done()]
+        self.pending.append(_FLUSH_EXECUTOR.submit(_flush, mm, offset, size))
+        return self.pending[-1]
+
+    def close(self):
+        self.stopped.set()
+        for f in self.pending:
+            f.result()
+        self.pending.clear()
+
+        mm = self._mmap()
+        if self.policy != "none" and mm is not None and not mm.closed:
+            mm.flush()
+
+
+def _flush(mm, offset, size):
+    if size:
+        mm.flush(offset, size)
+    else:
+        mm.flush()
+
+
+def _flush_periodically(mm_ref, stopped, interval):
+    while not stopped.wait(interval):
+        mm = mm_ref()
+        if mm is None or mm.closed:
+            break
+        mm.flush()
+        del mm
+
+
+def _is_gain(arr, other):
+    types = int, float, np.integer, np.floating
+    is_number = isinstance(other, types) and not isinstance(other, bool)
+    return is_number and issubclass(arr.dtype.type, np.integer)
+
+
+def _address(mm) -> int:
+    return np.frombuffer(mm, np.uint8).ctypes.data
+
 
 def file_byte_size(filename: str):
     with open(filename, "rb") as fp:
@@ -1,10 +1,9 @@
-import struct
 from typing import Optional, Type
 from collections.abc import Callable
 
 import numpy as np
 
-from . import docs, raw
+from . import channels, chunks, docs, raw
 from .structure import wave
 
 FLOAT_BITS_PER_SAMPLE = {32, 64}
@@ -14,13 +13,13 @@ BITS_PER_SAMPLE = PCM_BITS_PER_SAMPLE, FLOAT_BITS_PER_SAMPLE
 FMT_BLOCK_LENGTHS = {16, 18, 20, 40}
 MODES = "r", "r+", "c"
 
-# Deal with a quirk in certain .WAV test files
-BAD_TAG_ADJUSTMENT = True
-
 
 class ReadMap(raw.RawMap):
     """Memory-map an existing WAVE file into a numpy vector or matrix"""
 
+    # The dwChannelMask of a WAVE_FORMAT_EXTENSIBLE file, or None
+    channel_mask: int | None = None
+
     @docs.update(mode="READ_ONLY_MODE")
     def __new__(
         cls: type,
@@ -28,6 +27,8 @@ class ReadMap(raw.RawMap):
         mode: str = "r",
         order: str | None = None,
         always_2d: bool = False,
+        durability: str | float = "none",
+        track_dirty: bool = False,
         warn: Callable | None = raw.warn,
     ):
         # Documentation for parameters is in docs.py
@@ -39,139 +40,108 @@ class ReadMap(raw.RawMap):
         file_size = raw.file_byte_size(filename)
 
         with open(filename, "rb") as fp:
-            begin, end, fmt = _metadata(fp, warn, file_size)
-            offset = begin + wave.CHUNK.size
-            roffset = file_size - end
-
-        f = wave.FMT_PCM.unpack_from(fmt)
-
-        if f.wFormatTag == wave.WAVE_FORMAT_EXTENSIBLE:
-            g = wave.FMT_EXTENSION.unpack_from(fmt, offset=wave.FMT_PCM.size)
-            f.wFormatTag = g.wFormatTag
-
-        if f.wFormatTag not in wave.WAVE_FORMATS:
-            raise ValueError(f"Do not understand f.wFormatTag={f.wFormatTag}")
-
-        is_float = f.wFormatTag == wave.WAVE_FORMAT_IEEE_FLOAT
-
-        if f.wBitsPerSample == 24:
-            raise ValueError("Reading 24-bit WAVEs is not quite supported")
-
-        if f.wBitsPerSample not in BITS_PER_SAMPLE[is_float]:
-            raise ValueError(f"Cannot mmap f.wBitsPerSample={f.wBitsPerSample}")
+            table, data, fmt = _metadata(fp, warn, file_size)
 
-        if f.wBitsPerSample == 8:
-            dtype = "uint8"
-        else:
-            type_name = ("int", "float")[is_float]
-            dtype = f"{type_name}{f.wBitsPerSample}"
+        dtype, f, channel_mask = _format(fmt)
 
-        assert np.dtype(dtype).itemsize == f.wBitsPerSample // 8
         self = raw.RawMap.__new__(
             cls,
             filename=filename,
             dtype=dtype,
             mode=mode,
             shape=f.nChannels,
-            offset=offset,
-            roffset=roffset,
+            offset=data.data,
+            roffset=file_size - data.end,
             order=order,
             always_2d=always_2d,
+            durability=durability,
+            track_dirty=track_dirty,
             warn=warn,
         )
 
         self.sample_rate = f.nSamplesPerSec
+        self.chunks = table
+        self.channel_mask = channel_mask
         return self
 
+    def __array_finalize__(self, obj):
+        super().__array_finalize__(obj)
+        is_view = self._mmap is not None
+        for name in "channel_mask", "chunks":
+            setattr(self, name, getattr(obj, name, None) if is_view else None)
 
-def _metadata(fp, warn, file_size):
-    (tag, b, e), *chunks = _chunks(fp, warn, file_size)
-    if tag != b"WAVE":
-        raise ValueError(f"Not a WAVE file: {tag}")
-
-    assert b == 0
-    if e != file_size - 8:
-        warn(f"WAVE cksize is wrong: {e} != {file_size - 8}")
-
-    begin = end = fmt = None
-    for tag, b, e in chunks:
-        if tag == b"fmt ":
-            if not fmt:
-                fp.seek(b)
-                fmt = fp.read(e - b)
-            else:
-                warn("fmt chunk after first ignored")
-        elif tag == b"data":
-            if not (begin or end):
-                begin, end = b, e
-            else:
-                warn("data chunk after first ignored")
+    @property
+    def channel_layout(self) -> tuple[str | None, ...]:
+        """
+        The speaker position of each channel, from `channel_mask`, like
+        `("FL", "FR")`, with None for channels that have no position
+        """
+        count = 1 if self.ndim == 1 else self.shape[1]
+        return channels.layout(self.channel_mask, count)
 
-    if begin is None:
-        raise ValueError("No data chunk found")
 
-    if fmt is None:
-        raise ValueError("No fmt chunk found")
-
-    if (len(fmt) - wave.CHUNK.size) not in FMT_BLOCK_LENGTHS:
-        warn(f"Weird fmt block length {len(fmt)}")
-
-    return begin, end, fmt
+def _format(fmt):
+    # Return the dtype, the fields and the channel mask of a fmt chunk
+    f = wave.FMT_PCM.unpack_from(fmt)
+    channel_mask = None
 
+    if f.wFormatTag == wave.WAVE_FORMAT_EXTENSIBLE:
+        g = wave.FMT_EXTENSION.unpack_from(fmt, offset=wave.FMT_PCM.size)
+        f.wFormatTag = g.wFormatTag
+        channel_mask = int.from_bytes(g.dwChannelMask, "little")
 
-def _chunks(fp, warn, file_size):
-    class IncompleteChunk(ValueError):
-        pass
+    if f.wFormatTag not in wave.WAVE_FORMATS:
+        raise ValueError(f"Do not understand f.wFormatTag={f.wFormatTag}")
 
-    def read_one(format):
-        size = struct.calcsize(format)
-        s = fp.read(size)
-        if len(s) < size:
-            raise IncompleteChunk()
+    is_float = f.wFormatTag == wave.WAVE_FORMAT_IEEE_FLOAT
 
-        return struct.unpack("<" + format, s)[0]
+    if f.wBitsPerSample == 24:
+        raise ValueError("Reading 24-bit WAVEs is not quite supported")
 
-    def read_tag():
-        tag = read_one("4s")
-        if tag and not tag.rstrip().isalnum():
-            if BAD_TAG_ADJUSTMENT and tag[0] == 0:
-                tag = tag[1:] + fp.read(1)
-                if tag.rstrip().isalnum():
-                    return tag
+    if f.wBitsPerSample not in BITS_PER_SAMPLE[is_float]:
+        raise ValueError(f"Cannot mmap f.wBitsPerSample={f.wBitsPerSample}")
 
-            warn(f"Dubious tag {tag}")
+    if f.wBitsPerSample == 8:
+        dtype = "uint8"
+    else:
+        type_name = ("int", "float")[is_float]
+        dtype = f"{type_name}{f.wBitsPerSample}"
 
-        return tag
+    assert np.dtype(dtype).itemsize == f.wBitsPerSample // 8
+    return np.dtype(dtype), f, channel_mask
 
-    def read_int():
-        return read_one("I")
 
-    tag = read_tag()
-    if tag != b"RIFF":
-        raise ValueError("Not a RIFF file")
-
-    size = read_int()
-    yield read_tag(), 0, size
+def _metadata(fp, warn, file_size):
+    # Return the chunk table, the data chunk and the fmt chunk with its header
+    warn = warn or (lambda _: None)
+    table = chunks.read_chunks(fp, file_size, warn)
+
+    fp.seek(0)
+    riff = wave.RIFF.unpack_from(fp.read(wave.RIFF.size))
+    if riff.cksizeRiff != file_size - 8:
+        warn(f"WAVE cksize is wrong: {riff.cksizeRiff} != {file_size - 8}")
+
+    data = fmt = None
+    for chunk in table:
+        if chunk.tag == b"fmt ":
+            if fmt is None:
+                fp.seek(chunk.begin)
+                fmt = fp.read(chunk.end - chunk.begin)
+            else:
+                warn("fmt chunk after first ignored")
+        elif chunk.tag == b"data":
+            if data is None:
+                data = chunk
+            else:
+                warn("data chunk after first ignored")
 
-    while fp.tell() < file_size:
-        begin = fp.tell()
+    if data is None:
+        raise ValueError("No data chunk found")
 
-        try:
-            tag = read_tag()
-        except IncompleteChunk:
-            warn("Incomplete chunk: no tag")
-            break
+    if fmt is None:
+        raise ValueError("No fmt chunk found")
 
-        try:
-            chunk_size = read_int()
-        except IncompleteChunk:
-            warn("Incomplete chunk: no size")
-            break
+    if (len(fmt) - wave.CHUNK.size) not in FMT_BLOCK_LENGTHS:
+        warn(f"Weird fmt block length {len(fmt)}")
 
-        fp.seek(chunk_size, 1)
-        end = fp.tell()
-        if end > file_size:
-            if end > file_size + 1:
-                warn(f"Incomplete chunk: {end} > {file_size + 1}")
-            end = file_size
-        yield tag, begin, end
+    return table, data, fmt
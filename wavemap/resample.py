@@ -0,0 +1,203 @@
+"""Change the sample rate of audio with a streaming polyphase FIR filter"""
+
+import math
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from . import blocks, raw
+from .convert import convert
+from .write import WriteMap
+
+DEFAULT_TAPS = 64  # The length of the filter, in frames at the lower rate
+KAISER_BETA = 8.6
+KAISER_DB = KAISER_BETA / 0.1102 + 8.7  # The stopband attenuation of the window
+ROLLOFF = 0.94  # The highest cutoff, as a fraction of the lower Nyquist frequency
+RESAMPLE_DTYPE = np.dtype("float32")
+
+
+class Resampler:
+    """
+    Resample a stream of blocks of floating point frames by a rational ratio.
+
+    Each output frame is a dot product of the last few input frames with
+    one phase of a windowed sinc filter, whose stopband starts at the lower
+    of the two Nyquist frequencies.  The input frames needed by the next
+    block are kept between calls to `process()`, so the result does not
+    depend on how the input is split into blocks.
+    """
+
+    def __init__(
+        self,
+        source_rate: int,
+        sample_rate: int,
+        channels: int = 1,
+        taps: int = DEFAULT_TAPS,
+    ):
+        """
+        ARGUMENTS
+          source_rate
+            The sample rate of the input
+
+          sample_rate
+            The sample rate of the output
+
+          channels
+            The number of channels in each frame
+
+          taps
+            The length of the filter, counted in frames at the lower of the
+            two sample rates.  More taps give a sharper filter with a wider
+            passband, at a cost in time.
+        """
+        if min(source_rate, sample_rate, channels, taps) <= 0:
+            raise ValueError("Rates, channels and taps must be positive")
+
+        gcd = math.gcd(source_rate, sample_rate)
+        self.up = sample_rate // gcd
+        self.down = source_rate // gcd
+        self.channels = channels
+
+        # self.phases[p, k] is multiplied by input frame i - self.taps + 1 + k
+        phases = _design(self.up, self.down, taps)[:, ::-1]
+        self.phases = phases.astype(RESAMPLE_DTYPE)
+        self.taps = phases.shape[1]  # Taps in each phase, at the input rate
+        self.delay = (self.up * self.taps - 1) // 2
+
+        self.consumed = 0  # Input frames seen so far
+        self.produced = 0  # Output frames returned so far
+        self.history = np.zeros((self.taps - 1, channels), RESAMPLE_DTYPE)
+
+    def output_frames(self, input_frames: int) -> int:
+        """The number of frames that `input_frames` frames of input turn into"""
+        return -(-input_frames * self.up // self.down)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Return the output frames that can be computed after `block`"""
+        block = np.asarray(block, RESAMPLE_DTYPE).reshape(-1, self.channels)
+        frames = np.concatenate((self.history, block))
+        end = self.consumed + len(block)
+
+        # Output frame n needs input frames up to (n * down + delay) // up
+        stop = -(-(end * self.up - self.delay) // self.down)
+        n = np.arange(self.produced, max(stop, self.produced))
+        t = n * self.down + self.delay
+        first = t // self.up - self.consumed
+        coefficients = self.phases[t % self.up]
+
+        result = np.zeros((len(n), self.channels), RESAMPLE_DTYPE)
+        for k in range(self.taps):
+            result += frames[first + k] * coefficients[:, k, None]
+
+        self.history = frames[len(frames) - len(self.history) :].copy()
+        self.consumed = end
+        self.produced += len(n)
+        return result
+
+    def flush(self) -> np.ndarray:
+        """Return the rest of the output, as if the input was followed by silence"""
+        stop = self.output_frames(self.consumed)
+        last = ((stop - 1) * self.down + self.delay) // self.up
+        zeros = np.zeros((max(0, last + 1 - self.consumed), self.channels))
+        produced = self.produced
+        return self.process(zeros)[: stop - produced]
+
+
+def resample(
+    arr: np.ndarray,
+    filename: str | Path,
+    sample_rate: int,
+    source_rate: int | None = None,
+    dtype: np.dtype | None = None,
+    taps: int = DEFAULT_TAPS,
+    frames: int = blocks.DEFAULT_FRAMES,
+    threads: int = 1,
+    warn: Callable | None = raw.warn,
+) -> WriteMap:
+    """
+    Resample an array or `ReadMap` into a new WAVE file one block at a time,
+    and return a `WriteMap` of the new file.
+
+    ARGUMENTS
+      arr
+        The audio to resample
+
+      filename
+        The name of the new WAVE file
+
+      sample_rate
+        The sample rate of the new file
+
+      source_rate
+        The sample rate of `arr`.  If None, `arr.sample_rate` is used.
+
+      dtype
+        The type of the samples in the new file.  If None, the type of `arr`
+        is used.
+
+      taps
+        Passed to `Resampler`
+
+      frames
+        The number of input frames in each block
+
+      threads
+        If more than one, groups of channels are resampled in parallel by
+        this many threads
+
+      warn
+        Passed to `WriteMap`
+    """
+    source_rate = source_rate or getattr(arr, "sample_rate", None)
+    if not source_rate:
+        raise ValueError("The sample rate of the source is not known")
+
+    channels = 1 if arr.ndim == 1 else arr.shape[1]
+    length = Resampler(source_rate, sample_rate, 1, taps).output_frames(len(arr))
+    shape = (length, channels) if arr.ndim > 1 else (length,)
+    out = WriteMap(filename, dtype or arr.dtype, shape, sample_rate, warn=warn)
+
+    source = arr.reshape(-1, channels)
+    target = out.reshape(-1, channels)
+
+    def run(begin, end):
+        # Resample channels [begin, end) of the whole array
+        r = Resampler(source_rate, sample_rate, end - begin, taps)
+        position = 0
+        for b, e in blocks.ranges(len(arr), frames):
+            block = convert(source[b:e, begin:end], RESAMPLE_DTYPE)
+            position = _write(target, r.process(block), position, begin, end)
+        _write(target, r.flush(), position, begin, end)
+
+    groups = np.array_split(np.arange(channels), min(threads, channels))
+    bounds = [(g[0], g[-1] + 1) for g in groups if len(g)]
+    for _ in blocks.map_ranges(run, bounds, threads):
+        pass
+
+    blocks.mark_dirty(out)
+    return out
+
+
+def _write(target, block, position, begin, end):
+    stop = position + len(block)
+    target[position:stop, begin:end] = convert(block, target.dtype)
+    return stop
+
+
+def _design(up, down, taps):
+    # Return a windowed sinc lowpass filter for upsampling by `up`, split into
+    # `up` phases, long enough to span `taps` frames at the lower rate
+    ratio = max(up, down)
+    phase_taps = -(-taps * ratio // up)
+    size = up * phase_taps
+
+    # Kaiser's estimate of the transition width, as a fraction of the lower
+    # Nyquist frequency, which is where the stopband starts
+    width = (KAISER_DB - 7.95) / (2.285 * math.pi * size / ratio)
+    cutoff = min(ROLLOFF, 1 - width / 2) / ratio
+
+    t = np.arange(size) - (size - 1) / 2
+    h = np.sinc(cutoff * t) * np.kaiser(size, KAISER_BETA)
+    h *= up / h.sum()
+    return h.reshape(phase_taps, up).T
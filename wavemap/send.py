@@ -0,0 +1,67 @@
+import numpy as np
+
+from . import kernel, raw
+from .write import header
+
+
+def send_frames(
+    arr: np.ndarray,
+    out,
+    start: int = 0,
+    stop: int | None = None,
+    with_header: bool = True,
+) -> int:
+    """
+    Send frames of an array to a socket or a file descriptor as a WAVE file,
+    and return the number of bytes sent.
+
+    If `arr` is memory mapped from a file, the samples are sent straight
+    from that file with `os.sendfile`, without being copied into Python.
+
+    ARGUMENTS
+      arr
+        The array to send, usually a `ReadMap` or a slice of one
+
+      out
+        A socket, or anything else with a `fileno()`, or a file descriptor
+
+      start, stop
+        The range of frames of `arr` to send
+
+      with_header
+        If true, a WAVE header for the range is sent first, otherwise only
+        the samples are sent
+    """
+    start, stop, _ = slice(start, stop).indices(len(arr))
+    stop = max(start, stop)
+    fd = out if isinstance(out, int) else out.fileno()
+    channels = 1 if arr.ndim == 1 else arr.shape[1]
+    sent = 0
+
+    if with_header:
+        sample_rate = getattr(arr, "sample_rate", None)
+        if not sample_rate:
+            raise ValueError("Cannot send a header without a sample_rate")
+
+        h = header(arr.dtype, channels, stop - start, sample_rate)
+        kernel.write_all(fd, h)
+        sent += len(h)
+
+    frames = arr[start:stop]
+    if isinstance(arr, raw.RawMap) and arr.mode != "c" and frames._is_frames():
+        with open(arr.filename, "rb") as fp:
+            position = frames._file_position()
+            done = kernel.send_range(fd, fp.fileno(), position, frames.nbytes)
+        sent += done
+        frames = frames.view(np.uint8).reshape(-1)[done:]
+    else:
+        frames = np.ascontiguousarray(frames)
+
+    kernel.write_all(fd, frames)
+    sent += frames.nbytes
+
+    if with_header and (stop - start) * arr.itemsize * channels % 2:
+        kernel.write_all(fd, b"\0")
+        sent += 1
+
+    return sent
@@ -0,0 +1,89 @@
+"""
+Files of data computed from a WAVE file, kept next to it and ignored once
+the WAVE file changes
+"""
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from .structure.structure import INT64, Structure
+
+HEADER = Structure(magic="4s", sourceSize=INT64, sourceMtime=INT64)
+TEMPORARY_SUFFIX = ".tmp"
+
+
+class Sidecar:
+    """
+    A memory-mapped file named after a source file, which is only valid while
+    the source file has the same size and modification time as when the
+    sidecar was written
+    """
+
+    def __init__(self, filename: str | Path, suffix: str, magic: bytes):
+        if len(magic) != 4:
+            raise ValueError(f"magic must be four bytes: {magic!r}")
+
+        self.filename = Path(filename)
+        self.path = Path(str(filename) + suffix)
+        self.magic = magic
+
+    def load(self) -> np.ndarray | None:
+        """
+        Map the body of the sidecar read-only, or return None if it is
+        missing or out of date
+        """
+        try:
+            mm = np.memmap(self.path, np.uint8, "r")
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if len(mm) < HEADER.size:
+            return None
+
+        h = HEADER.unpack_from(mm)
+        if h.magic != self.magic or (h.sourceSize, h.sourceMtime) != self._stamp():
+            return None
+
+        return mm[HEADER.size :]
+
+    def write(self, size: int, fill: Callable[[np.ndarray], None]) -> np.ndarray | None:
+        """
+        Write a sidecar whose body of `size` bytes is filled in by calling
+        `fill` with a writable map of it, and return `load()`.
+
+        The sidecar is written to a temporary file and then renamed, so no one
+        ever sees one that is half written.
+        """
+        source_size, source_mtime = self._stamp()
+        temporary = self.path.with_name(self.path.name + TEMPORARY_SUFFIX)
+        try:
+            mm = np.memmap(temporary, np.uint8, "w+", shape=HEADER.size + size)
+            fill(mm[HEADER.size :])
+            HEADER.pack_into(
+                mm,
+                magic=self.magic,
+                sourceSize=source_size,
+                sourceMtime=source_mtime,
+            )
+            mm.flush()
+            del mm
+            os.replace(temporary, self.path)
+        finally:
+            temporary.unlink(missing_ok=True)
+
+        return self.load()
+
+    def delete(self):
+        self.path.unlink(missing_ok=True)
+
+    def _stamp(self):
+        return stamp(self.filename)
+
+
+def stamp(filename: str | Path) -> tuple[int, int]:
+    """Return the size and modification time of a file, to tell if it changed"""
+    s = os.stat(filename)
+    return s.st_size, s.st_mtime_ns
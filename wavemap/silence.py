@@ -0,0 +1,157 @@
+"""Find the regions of an array or WAVE file that are not silent"""
+
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import numpy as np
+
+from . import blocks, raw
+from .convert import _full_scale
+from .ranges import Ranges
+from .read import ReadMap
+from .sidecar import Sidecar
+from .structure.structure import INT64, Structure
+
+DEFAULT_THRESHOLD = 0.001  # 60dB below full scale
+MAGIC = b"WMAC"
+SUFFIX = ".activity"
+
+HEADER = Structure(threshold="d", minSilence=INT64, count=INT64)
+
+
+def find_active(
+    arr: np.ndarray,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_silence: int = 0,
+    frames: int = blocks.DEFAULT_FRAMES,
+    threads: int = 1,
+) -> Ranges:
+    """
+    Return the ranges of frames where any channel is louder than `threshold`,
+    a fraction of full scale, reading the array one block at a time.
+
+    Silences shorter than `min_silence` frames between two active ranges are
+    counted as active.
+    """
+    low, high = _limits(arr.dtype, threshold)
+
+    def scan(begin, end):
+        block = arr[begin:end]
+        loud = (block < low) | (block > high)
+        if loud.ndim > 1:
+            loud = loud.any(axis=1)
+
+        edges = np.flatnonzero(np.diff(loud, prepend=False, append=False))
+        return edges.reshape(-1, 2) + begin
+
+    found = []
+    for pairs in blocks.map_ranges(scan, blocks.ranges(len(arr), frames), threads):
+        for start, stop in pairs.tolist():
+            if found and start - found[-1][1] < max(min_silence, 1):
+                found[-1][1] = stop
+            else:
+                found.append([start, stop])
+
+    return Ranges(found)
+
+
+class Activity:
+    """
+    The regions of a WAVE file that are not silent, found once and kept in a
+    small sidecar file, so later jobs can skip the silence without reading it
+    """
+
+    def __init__(
+        self,
+        filename: str | Path,
+        threshold: float = DEFAULT_THRESHOLD,
+        min_silence: int = 0,
+        threads: int = 1,
+        warn: Callable | None = raw.warn,
+    ):
+        """
+        ARGUMENTS
+          filename
+            The WAVE file to index
+
+          threshold
+            Frames where every channel is at or below this fraction of full
+            scale are silent
+
+          min_silence
+            Silences shorter than this many frames are counted as active
+
+          threads
+            If more than one, the file is scanned by this many threads
+
+          warn
+            Passed to `ReadMap`
+        """
+        self.source = ReadMap(filename, warn=warn)
+        self.threshold = threshold
+        self.min_silence = min_silence
+        self.sidecar = Sidecar(filename, SUFFIX, MAGIC)
+
+        self.ranges = self._load()
+        if self.ranges is None:
+            self.ranges = find_active(
+                self.source, threshold, min_silence, threads=threads
+            )
+            self._save()
+
+    @property
+    def frames(self) -> int:
+        """The number of frames that are not silent"""
+        return self.ranges.frames
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return self.regions()
+
+    def regions(self, start: int = 0, stop: int | None = None) -> Iterator[np.ndarray]:
+        """
+        Yield a view of the source for each active region inside frames
+        `[start, stop)`.  No samples are read until the views are used.
+        """
+        stop = len(self.source) if stop is None else stop
+        for begin, end in self.ranges.overlapping(start, stop):
+            yield self.source[begin:end]
+
+    def _load(self):
+        body = self.sidecar.load()
+        if body is None or len(body) < HEADER.size:
+            return None
+
+        h = HEADER.unpack_from(body)
+        params = self.threshold, self.min_silence
+        if (h.threshold, h.minSilence) != params:
+            return None
+
+        pairs = np.frombuffer(body, np.int64, 2 * h.count, HEADER.size)
+        return Ranges(pairs.reshape(-1, 2).tolist())
+
+    def _save(self):
+        pairs = np.array(list(self.ranges), np.int64).reshape(-1, 2)
+
+        def fill(body):
+            HEADER.pack_into(
+                body,
+                threshold=float(self.threshold),
+                minSilence=self.min_silence,
+                count=len(pairs),
+            )
+            body[HEADER.size :] = pairs.view(np.uint8).ravel()
+
+        self.sidecar.write(HEADER.size + pairs.nbytes, fill)
+
+
+def _limits(dtype, threshold):
+    # Samples strictly between these limits are silent
+    center, bottom, top = _full_scale(dtype)
+    low = center - threshold * (center - bottom)
+    high = center + threshold * (top - center)
+    if issubclass(dtype.type, np.integer):
+        low, high = np.ceil(low), np.floor(high)
+    return dtype.type(low), dtype.type(high)
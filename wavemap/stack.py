@@ -0,0 +1,116 @@
+from collections.abc import Callable, Iterator, Sequence
+from pathlib import Path
+
+import numpy as np
+
+from . import blocks, raw
+from .read import ReadMap
+
+
+class StackMap:
+    """
+    Equal-length WAVE files or arrays, stacked lazily into one array with
+    shape `(stems, frames, channels)`
+    """
+
+    def __init__(
+        self,
+        maps: Sequence[np.ndarray | str | Path],
+        warn: Callable | None = raw.warn,
+    ):
+        """
+        ARGUMENTS
+          maps
+            A sequence of arrays, or of names of WAVE files to map with
+            `ReadMap`.  They must all have the same length, dtype, number of
+            channels and sample rate.  Mono arrays are treated as having
+            one channel.
+
+          warn
+            Passed to `ReadMap` for each file name
+        """
+        self.maps = [
+            ReadMap(m, always_2d=True, warn=warn) if isinstance(m, (str, Path)) else m
+            for m in maps
+        ]
+        if not self.maps:
+            raise ValueError("StackMap needs at least one array")
+
+        self.maps = [m[:, None] if m.ndim == 1 else m for m in self.maps]
+        first = self.maps[0]
+        for m in self.maps[1:]:
+            if m.dtype != first.dtype:
+                raise ValueError(f"Different dtypes: {m.dtype} != {first.dtype}")
+            if m.shape != first.shape:
+                raise ValueError(f"Different shapes: {m.shape} != {first.shape}")
+            if getattr(m, "sample_rate", None) != self.sample_rate:
+                raise ValueError("Different sample rates")
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.maps[0].dtype
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self.maps), *self.maps[0].shape)
+
+    @property
+    def ndim(self) -> int:
+        return 3
+
+    @property
+    def frames(self) -> int:
+        return len(self.maps[0])
+
+    @property
+    def sample_rate(self) -> int | None:
+        return getattr(self.maps[0], "sample_rate", None)
+
+    def __len__(self) -> int:
+        return len(self.maps)
+
+    def __array__(self, dtype=None):
+        return self.read(0, self.frames).astype(dtype or self.dtype, copy=False)
+
+    def __getitem__(self, key):
+        stem, *rest = key if isinstance(key, tuple) else (key,)
+        if isinstance(stem, (int, np.integer)):
+            return self.maps[stem][tuple(rest)]
+
+        stems = np.arange(len(self.maps))[stem]
+        rest = tuple(rest) or slice(None)
+        start, stop, local, rest = blocks.split_key(rest, self.frames, "StackMap")
+        return self.read(start, stop, stems=stems)[(slice(None), local, *rest)]
+
+    def read(
+        self,
+        start: int,
+        stop: int,
+        out: np.ndarray | None = None,
+        stems: Sequence[int] | None = None,
+    ) -> np.ndarray:
+        """
+        Copy frames `[start, stop)` of each stem into `out`, or into a new
+        array with shape `(stems, stop - start, channels)`
+        """
+        if stems is None:
+            stems = range(len(self.maps))
+        if out is None:
+            out = np.empty((len(stems), stop - start, *self.shape[2:]), self.dtype)
+
+        for i, s in enumerate(stems):
+            out[i] = self.maps[s][start:stop]
+        return out
+
+    def blocks(self, frames: int = blocks.DEFAULT_FRAMES) -> Iterator[np.ndarray]:
+        """
+        Yield blocks with shape `(stems, frames, channels)`.
+
+        Every block is a view of the same buffer, which is overwritten by the
+        next block, so memory use depends only on `frames`.
+        """
+        buffer = np.empty(
+            (len(self.maps), min(frames, self.frames), *self.shape[2:]), self.dtype
+        )
+        for begin, end in blocks.ranges(self.frames, frames):
+            yield self.read(begin, end, out=buffer[:, : end - begin])
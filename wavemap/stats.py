@@ -0,0 +1,123 @@
+"""Compute level statistics of each channel of an array in one blocked pass"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from . import blocks
+from .convert import _full_scale
+
+
+class Stats(NamedTuple):
+    """
+    Statistics for each channel, in the units of the samples, measured from
+    silence, so unsigned samples are offset by minus half their range.  For windowed
+    statistics, each field has an extra first axis, one entry per window.
+    """
+
+    min: np.ndarray
+    max: np.ndarray
+    peak: np.ndarray  # The largest absolute value
+    rms: np.ndarray
+    dc: np.ndarray  # The mean
+    clipped: np.ndarray  # The number of samples at or past full scale
+    frames: np.ndarray
+
+
+def stats(
+    arr: np.ndarray,
+    window: int | None = None,
+    frames: int = blocks.DEFAULT_FRAMES,
+    threads: int = 1,
+) -> tuple[Stats, Stats | None]:
+    """
+    Return statistics for the whole array, and for each window of `window`
+    frames if `window` is set, or else None.
+
+    Every statistic comes from the same pass over each block.  Clipping is
+    computed on the samples as they are, and everything else on the samples
+    less the value of silence.  Sums of samples and squares of 8 and 16 bit
+    integers are accumulated exactly in int64, and other types in float64.
+
+    ARGUMENTS
+      arr
+        A numpy array, or a `ReadMap`
+
+      window
+        If set, also compute statistics for each window of this many frames
+
+      frames
+        The number of frames in each block, rounded down to a whole number of
+        windows
+
+      threads
+        If more than one, blocks are read in parallel by this many threads
+    """
+    if not len(arr):
+        raise ValueError("Cannot compute statistics of an empty array")
+
+    if arr.ndim == 1:
+        arr = arr[:, None]
+
+    size = window or frames
+    if size <= 0:
+        raise ValueError(f"window must be positive: {size}")
+
+    block_frames = max(size, frames // size * size)
+    ranges = blocks.ranges(len(arr), block_frames)
+    parts = blocks.map_ranges(lambda b, e: _sums(arr[b:e], size), ranges, threads)
+    sums = _Sums(*(np.concatenate(p) for p in zip(*parts)))
+
+    total = _Sums(
+        sums.min.min(0),
+        sums.max.max(0),
+        sums.sum.sum(0),
+        sums.squares.sum(0),
+        sums.clipped.sum(0),
+        sums.frames.sum(0),
+    )
+    return _finish(total), window and _finish(sums)
+
+
+class _Sums(NamedTuple):
+    min: np.ndarray
+    max: np.ndarray
+    sum: np.ndarray
+    squares: np.ndarray
+    clipped: np.ndarray
+    frames: np.ndarray
+
+
+def _sums(block, window):
+    # Reduce each window of a block
+    starts = np.arange(0, len(block), window)
+    center, bottom, top = _full_scale(block.dtype)
+    if issubclass(block.dtype.type, np.integer) and block.dtype.itemsize <= 2:
+        dtype = np.int64
+    else:
+        dtype = np.float64
+
+    clipped = (block <= bottom) | (block >= top)
+    if center:
+        block = block.astype(np.int64) - center
+    return _Sums(
+        np.minimum.reduceat(block, starts, axis=0),
+        np.maximum.reduceat(block, starts, axis=0),
+        np.add.reduceat(block, starts, axis=0, dtype=dtype),
+        np.add.reduceat(np.square(block, dtype=dtype), starts, axis=0),
+        np.add.reduceat(clipped, starts, axis=0, dtype=np.int64),
+        np.diff(starts, append=len(block)),
+    )
+
+
+def _finish(s):
+    frames = s.frames[..., None]
+    return Stats(
+        min=s.min,
+        max=s.max,
+        peak=np.maximum(np.abs(s.min.astype(np.float64)), s.max),
+        rms=np.sqrt(s.squares / frames),
+        dc=s.sum / frames,
+        clipped=s.clipped,
+        frames=s.frames,
+    )
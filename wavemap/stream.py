@@ -0,0 +1,310 @@
+"""Read and write WAVE files on streams that can't seek, like pipes and sockets"""
+
+import io
+import os
+from collections.abc import Callable, Iterator
+from typing import BinaryIO
+
+import numpy as np
+
+from . import blocks, channels, kernel, raw
+from .convert import convert
+from .read import _format
+from .structure import wave
+from .write import _header
+
+# Streaming writers put one of these in a size field when they don't know it
+UNKNOWN_SIZES = 0, 0xFFFFFFFF
+SKIP_BYTES = 0x10000
+
+BATCH_BYTES = 0x40000  # StreamWriter writes once this much data is waiting
+MAX_BUFFERS = 1024  # The most buffers passed to one call of os.writev
+
+
+class StreamReader:
+    """
+    Read the samples of a WAVE file from a binary stream, in order, one block
+    at a time, without seeking.
+
+    The header is parsed as it arrives.  Each block is read with `readinto`
+    into the same buffer, so the blocks that `blocks()` yields are only valid
+    until the next one is read.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        frames: int = blocks.DEFAULT_FRAMES,
+        always_2d: bool = False,
+        warn: Callable | None = raw.warn,
+    ):
+        """
+        ARGUMENTS
+          stream
+            A binary stream, like `sys.stdin.buffer` or a socket's `makefile("rb")`
+
+          frames
+            The largest number of frames in each block
+
+          always_2d
+            If true, mono files are read as matrices with one column
+
+          warn
+            Called with a message for recoverable problems, like a stream
+            that ends in the middle of a frame
+        """
+        self.stream = stream
+        self.frames = frames
+        self.always_2d = always_2d
+        self.warn = warn or (lambda _: None)
+
+        riff = wave.RIFF.unpack_from(self._read(wave.RIFF.size))
+        if riff.ckIDRiff != b"RIFF":
+            raise ValueError("Not a RIFF stream")
+        if riff.WAVEID != b"WAVE":
+            raise ValueError(f"Not a WAVE stream: {riff.WAVEID}")
+
+        fmt = None
+        while True:
+            header = self._read(wave.CHUNK.size)
+            chunk = wave.CHUNK.unpack_from(header)
+            if chunk.ckID == b"data":
+                break
+
+            size = chunk.cksize + chunk.cksize % 2
+            if chunk.ckID == b"fmt " and fmt is None:
+                fmt = header + self._read(size)
+            else:
+                self._skip(size)
+
+        if fmt is None:
+            raise ValueError("No fmt chunk before the data chunk")
+
+        self.dtype, f, self.channel_mask = _format(fmt)
+        self.channels = f.nChannels
+        self.sample_rate = f.nSamplesPerSec
+        self.frame_bytes = self.dtype.itemsize * self.channels
+
+        size = chunk.cksize
+        self.remaining = None if size in UNKNOWN_SIZES else size
+        self.frames_read = 0
+
+    @property
+    def channel_layout(self) -> tuple[str | None, ...]:
+        return channels.layout(self.channel_mask, self.channels)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return self.blocks()
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        """
+        Yield blocks of at most `frames` frames until the data chunk or the
+        stream ends
+        """
+        buffer = np.empty((self.frames, self.channels), self.dtype)
+        view = memoryview(buffer).cast("B")
+        filled = 0
+
+        while True:
+            want = len(view) - filled
+            if self.remaining is not None:
+                want = min(want, self.remaining)
+
+            count = self._read_into(view[filled : filled + want]) if want else 0
+            if self.remaining is not None:
+                self.remaining -= count
+            filled += count
+
+            frames, extra = divmod(filled, self.frame_bytes)
+            if frames and (filled == len(view) or not count):
+                self.frames_read += frames
+                yield self._shape(buffer[:frames])
+                view[:extra] = view[frames * self.frame_bytes : filled]
+                filled = extra
+
+            if not count:
+                if filled:
+                    self.warn(f"Stream ended {filled} bytes into a frame")
+                return
+
+    def _shape(self, block):
+        return block if self.always_2d or self.channels > 1 else block[:, 0]
+
+    def _read_into(self, view):
+        # Read until view is full or the stream ends; return the bytes read
+        done = 0
+        while done < len(view):
+            if readinto := getattr(self.stream, "readinto", None):
+                n = readinto(view[done:])
+            else:
+                data = self.stream.read(len(view) - done)
+                n = len(data)
+                view[done : done + n] = data
+            if not n:
+                break
+            done += n
+        return done
+
+    def _read(self, size):
+        data = bytearray(size)
+        if self._read_into(memoryview(data)) != size:
+            raise ValueError("Stream ended in the WAVE header")
+        return bytes(data)
+
+    def _skip(self, size):
+        while size:
+            size -= len(self._read(min(size, SKIP_BYTES)))
+
+
+class StreamWriter:
+    """
+    Write a WAVE file to a binary stream, in order, one block at a time,
+    without seeking.
+
+    The header goes out first.  If the number of frames is not known in
+    advance, its size fields hold `0xFFFFFFFF`, which most readers take to
+    mean "read until the stream ends".  If the stream turns out to be
+    seekable, the sizes are filled in when it is closed.
+
+    Blocks are converted to the stream's type and held until `batch_bytes`
+    are waiting, and then written together, with `os.writev` when the
+    stream has a file descriptor.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        dtype: np.dtype,
+        channels: int,
+        sample_rate: int,
+        frames: int | None = None,
+        batch_bytes: int = BATCH_BYTES,
+        warn: Callable | None = raw.warn,
+    ):
+        """
+        ARGUMENTS
+          stream
+            A binary stream, like `sys.stdout.buffer` or a socket's
+            `makefile("wb")`
+
+          dtype
+            The type of the samples in the stream
+
+          channels
+            The number of channels in each frame
+
+          sample_rate
+            The sample rate of the stream
+
+          frames
+            The number of frames that will be written, if known
+
+          batch_bytes
+            How many bytes of samples to hold before writing them
+
+          warn
+            Called with a message for recoverable problems, like closing
+            the writer before `frames` frames were written
+        """
+        self.stream = stream
+        self.dtype = np.dtype(dtype)
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.frames = frames
+        self.batch_bytes = batch_bytes
+        self.warn = warn or (lambda _: None)
+
+        self.frame_bytes = self.dtype.itemsize * channels
+        self.frames_written = 0
+        self.closed = False
+        self._bytes_written = 0
+        self._pending = [self._header(frames)]
+        self._pending_bytes = 0
+        self._flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def write(self, block: np.ndarray) -> None:
+        """Convert a block of frames of any type, and write it to the stream"""
+        if self.closed:
+            raise ValueError("Write to a closed StreamWriter")
+
+        block = np.asarray(block)
+        if block.ndim > 2 or block.size % self.channels:
+            raise ValueError(f"Block shape {block.shape} for {self.channels} channels")
+
+        count = block.size // self.channels
+        if self.frames is not None and self.frames_written + count > self.frames:
+            raise ValueError(f"More than {self.frames} frames written")
+
+        # Pending blocks outlive the call, so they can't share the caller's memory
+        data = convert(block, self.dtype, must_copy=True)
+        self._pending.append(memoryview(np.ascontiguousarray(data)).cast("B"))
+        self._pending_bytes += data.nbytes
+        self.frames_written += count
+
+        if self._pending_bytes >= self.batch_bytes:
+            self._flush()
+
+    def close(self) -> None:
+        """
+        Write any pending blocks and the pad byte, and fill in the header if
+        the stream can seek.  The stream itself is left open.
+        """
+        if self.closed:
+            return
+        self.closed = True
+
+        if self.frames is not None and self.frames_written != self.frames:
+            self.warn(f"Wrote {self.frames_written} of {self.frames} frames")
+
+        if (self.frames_written * self.frame_bytes) % 2:
+            self._pending.append(b"\0")
+        self._flush()
+
+        if self.frames != self.frames_written and _seekable(self.stream):
+            end = self.stream.tell()
+            self.stream.seek(end - self._bytes_written)
+            self.stream.write(self._header(self.frames_written))
+            self.stream.seek(end)
+        self.stream.flush()
+
+    def _header(self, frames):
+        structure, fields = _header(
+            self.dtype, self.channels, frames or 0, self.sample_rate
+        )
+        if frames is None:
+            unknown = UNKNOWN_SIZES[1]
+            fields.update(cksizeRiff=unknown, cksizeData=unknown)
+            fields.update(dwSampleLength=unknown)
+        return structure.pack(**fields)
+
+    def _flush(self):
+        buffers, self._pending, self._pending_bytes = self._pending, [], 0
+        self._bytes_written += sum(len(b) for b in buffers)
+        _writev(self.stream, buffers)
+
+
+def _writev(stream, buffers):
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fd = None
+
+    if fd is None or not hasattr(os, "writev"):
+        for b in buffers:
+            stream.write(b)
+    else:
+        stream.flush()
+        kernel.writev_all(fd, buffers, MAX_BUFFERS)
+
+
+def _seekable(stream):
+    try:
+        return stream.seekable()
+    except (AttributeError, OSError, ValueError):
+        return False
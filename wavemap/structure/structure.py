@@ -5,8 +5,9 @@ from argparse import Namespace
 
 INT16 = "H"
 INT32 = "I"
+INT64 = "Q"
 
-INT = INT16, INT32
+INT = INT16, INT32, INT64
 
 
 class Structure:
@@ -0,0 +1,111 @@
+import os
+from collections.abc import Callable
+
+from . import raw
+from .chunks import FILLER_TAGS, JUNK, chunk_header, find, read_chunks
+from .structure import wave
+
+
+def truncate(
+    filename: str,
+    frames: int | None = None,
+    start: int = 0,
+    warn: Callable | None = raw.warn,
+) -> int:
+    """
+    Cut a WAVE file down to `frames` frames beginning at frame `start`,
+    in place, writing only metadata.  Returns the new number of frames.
+
+    The end of the file is cut off with `ftruncate`, after moving any chunks
+    following the sample data.  Frames at the start are dropped by writing
+    a new header that ends just before the first kept frame, with a `JUNK`
+    chunk hiding the rest.  This needs at least 8 bytes of room, and the
+    first kept frame must start on an even byte.
+
+    Any memory map of the file must not be used after this is called.
+
+    ARGUMENTS
+      filename
+        The WAVE file to change
+
+      frames
+        How many frames to keep: `None` means "all the remaining frames"
+
+      start
+        The first frame to keep
+    """
+    with open(filename, "r+b") as fp:
+        chunks = read_chunks(fp, warn=warn)
+        data, fmt = find(chunks, b"data"), find(chunks, b"fmt ")
+        if data is None:
+            raise ValueError("No data chunk found")
+        if fmt is None:
+            raise ValueError("No fmt chunk found")
+
+        fp.seek(fmt.begin)
+        f = wave.FMT_PCM.unpack_from(fp.read(wave.FMT_PCM.size))
+        count = data.size // f.nBlockAlign
+        if frames is None:
+            frames = count - start
+
+        if not (0 <= start and 0 <= frames and start + frames <= count):
+            raise ValueError(f"Cannot keep {frames} frames from {start} of {count}")
+
+        fp.seek(data.padded_end)
+        trailer = fp.read()
+        before = chunks[: chunks.index(data)]
+
+        if start:
+            begin = data.data + start * f.nBlockAlign - wave.CHUNK.size
+            before, writes = _relocate(fp, before, begin)
+        else:
+            begin, writes = data.begin, []
+
+        size = frames * f.nBlockAlign
+        end = begin + wave.CHUNK.size + size
+        writes.append((begin, chunk_header(b"data", size)))
+        if size % 2:
+            writes.append((end, b"\0"))
+            end += 1
+
+        if fact := find(before, b"fact"):
+            sample_length = (frames * f.nChannels).to_bytes(4, "little")
+            writes.append((fact.data, sample_length))
+
+        file_size = end + len(trailer)
+        writes.append((end, trailer))
+        writes.append((4, (file_size - wave.CHUNK.size).to_bytes(4, "little")))
+
+        for position, b in writes:
+            fp.seek(position)
+            fp.write(b)
+
+        fp.truncate(file_size)
+        fp.flush()
+        os.fsync(fp.fileno())
+
+    return frames
+
+
+def _relocate(fp, before, begin):
+    # Pack the chunks before the data up against the RIFF header, and fill
+    # the space up to the new data chunk at `begin` with a JUNK chunk
+    moved, writes, position = [], [], wave.RIFF.size
+    for c in before:
+        if c.tag not in FILLER_TAGS:
+            fp.seek(c.begin)
+            writes.append((position, fp.read(c.padded_end - c.begin)))
+            moved.append(c._replace(begin=position))
+            position = moved[-1].padded_end
+
+    if begin % 2:
+        raise ValueError("Cannot start the data chunk on an odd byte")
+
+    room = begin - position
+    if room < 0 or 0 < room < wave.CHUNK.size:
+        raise ValueError(f"No room for a new header: {room} bytes")
+
+    if room:
+        writes.append((position, chunk_header(JUNK, room - wave.CHUNK.size)))
+
+    return moved, writes
@@ -1,14 +1,17 @@
+import os
 from typing import Optional, Type, Union
 from collections.abc import Callable
 
 import numpy as np
 
-from . import docs, raw
+from . import docs, kernel, raw
+from .chunks import FILLER_TAGS, chunk_header, read_chunks
 from .structure import wave
 from .structure.wave import FMT_NON_PCM, FMT_PCM, NON_PCM, PCM
 
 CHUNK_HEADER = 8
 DEFAULT_SAMPLE_RATE = 44100
+HEADER_TAGS = b"fmt ", b"fact", b"data"
 
 
 class WriteMap(raw.RawMap):
@@ -22,6 +25,8 @@ class WriteMap(raw.RawMap):
         shape: None | int | tuple,
         sample_rate: int,
         roffset: int = 0,
+        durability: str | float = "none",
+        track_dirty: bool = False,
         warn: Callable | None = raw.warn,
     ):
         """
@@ -30,22 +35,11 @@ class WriteMap(raw.RawMap):
         """
         # Documentation for parameters is in docs.py
         dtype = np.dtype(dtype)
-
-        if issubclass(dtype.type, np.integer):
-            wFormatTag = wave.WAVE_FORMAT_PCM
-            structure = PCM
-            fmt_structure = FMT_PCM
-        else:
-            wFormatTag = wave.WAVE_FORMAT_IEEE_FLOAT
-            structure = NON_PCM
-            fmt_structure = FMT_NON_PCM
-
         channel_count = 1 if len(shape) == 1 else min(shape)
         frame_count = max(shape)
+        structure, fields = _header(dtype, channel_count, frame_count, sample_rate)
 
-        sample_bytes = dtype.itemsize
-        frame_bytes = sample_bytes * channel_count
-        total_frame_bytes = frame_bytes * frame_count
+        total_frame_bytes = fields["cksizeData"]
         pad = total_frame_bytes % 2
 
         self = raw.RawMap.__new__(
@@ -56,32 +50,14 @@ class WriteMap(raw.RawMap):
             shape=shape,
             offset=structure.size,
             roffset=roffset + pad,
+            durability=durability,
+            track_dirty=track_dirty,
             warn=warn,
         )
 
         self.file_size = structure.size + total_frame_bytes + pad
         self.sample_rate = sample_rate
-
-        structure.pack_into(
-            self._mmap,
-            ckIDRiff=b"RIFF",
-            cksizeRiff=self.file_size - CHUNK_HEADER,
-            WAVEID=b"WAVE",
-            ckIDFmt=b"fmt ",
-            cksizeFmt=fmt_structure.size - CHUNK_HEADER,
-            wFormatTag=wFormatTag,
-            nChannels=channel_count,
-            nSamplesPerSec=sample_rate,
-            nAvgBytesPerSec=sample_rate * frame_bytes,
-            nBlockAlign=frame_bytes,
-            wBitsPerSample=sample_bytes * 8,
-            cbSize=0,  # Non PCM
-            ckIDFact=b"fact",
-            cksizeFact=4,
-            dwSampleLength=channel_count * frame_count,
-            ckIDData=b"data",
-            cksizeData=total_frame_bytes,
-        )
+        structure.pack_into(self._mmap, **fields)
 
         return self
 
@@ -93,14 +69,25 @@ class WriteMap(raw.RawMap):
         sample_rate: int | None = None,
         roffset: int | None = None,
         warn: Callable | None = raw.warn,
+        durability: str | float = "none",
+        track_dirty: bool = False,
     ):
         if sample_rate is None:
-            sample_rate = getattr(arr, "sample_rate", DEFAULT_SAMPLE_RATE)
+            sample_rate = getattr(arr, "sample_rate", None) or DEFAULT_SAMPLE_RATE
 
         if roffset is None:
             roffset = getattr(arr, "roffset", 0)
 
-        return cls(filename, arr.dtype, arr.shape, sample_rate, roffset, warn)
+        return cls(
+            filename,
+            arr.dtype,
+            arr.shape,
+            sample_rate,
+            roffset,
+            durability=durability,
+            track_dirty=track_dirty,
+            warn=warn,
+        )
 
     @classmethod
     def copy_to(
@@ -110,7 +97,133 @@ class WriteMap(raw.RawMap):
         sample_rate: int | None = None,
         roffset: int | None = None,
         warn: Callable | None = raw.warn,
+        durability: str | float = "none",
+        track_dirty: bool = False,
+        chunks: bool = False,
     ):
-        wm = cls.new_like(arr, filename, sample_rate, roffset, warn)
-        np.copyto(src=arr, dst=wm, casting="no")
+        """
+        Copy an array into a new WAVE file.
+
+        When `arr` is a map of a file in the same layout, the samples are
+        copied inside the kernel, without faulting in the pages of either map.
+
+        If `chunks` is true, every chunk of the file that `arr` was mapped
+        from, except for the header and the sample data, is copied byte for
+        byte after the new sample data, in place of `roffset`, which must then
+        be None.
+        """
+        extra = b""
+        if chunks:
+            if roffset is not None:
+                raise ValueError("roffset cannot be set when copying chunks")
+            extra = _extra_chunks(arr, warn)
+            roffset = len(extra)
+
+        wm = cls.new_like(
+            arr, filename, sample_rate, roffset, warn, durability, track_dirty
+        )
+        if _can_copy_file(arr, wm):
+            _copy_file(arr, wm)
+        else:
+            np.copyto(src=arr, dst=wm, casting="no")
+        wm.mark_dirty(0, wm._frame_count())
+
+        if extra:
+            begin = wm.file_size
+            wm._mmap[begin : begin + len(extra)] = extra
+            wm.file_size = begin + len(extra)
+            riff_size = wm.file_size - CHUNK_HEADER
+            wave.RIFF.pack_into(
+                wm._mmap, ckIDRiff=b"RIFF", cksizeRiff=riff_size, WAVEID=b"WAVE"
+            )
+
         return wm
+
+
+def header(
+    dtype: np.dtype, channel_count: int, frame_count: int, sample_rate: int
+) -> bytes:
+    """Return the header of a WAVE file with no chunks but `fmt ` and `data`"""
+    structure, fields = _header(
+        np.dtype(dtype), channel_count, frame_count, sample_rate
+    )
+    return structure.pack(**fields)
+
+
+def _header(dtype, channel_count, frame_count, sample_rate):
+    if issubclass(dtype.type, np.integer):
+        wFormatTag = wave.WAVE_FORMAT_PCM
+        structure = PCM
+        fmt_structure = FMT_PCM
+    else:
+        wFormatTag = wave.WAVE_FORMAT_IEEE_FLOAT
+        structure = NON_PCM
+        fmt_structure = FMT_NON_PCM
+
+    sample_bytes = dtype.itemsize
+    frame_bytes = sample_bytes * channel_count
+    total_frame_bytes = frame_bytes * frame_count
+    file_size = structure.size + total_frame_bytes + total_frame_bytes % 2
+
+    return structure, {
+        "ckIDRiff": b"RIFF",
+        "cksizeRiff": file_size - CHUNK_HEADER,
+        "WAVEID": b"WAVE",
+        "ckIDFmt": b"fmt ",
+        "cksizeFmt": fmt_structure.size - CHUNK_HEADER,
+        "wFormatTag": wFormatTag,
+        "nChannels": channel_count,
+        "nSamplesPerSec": sample_rate,
+        "nAvgBytesPerSec": sample_rate * frame_bytes,
+        "nBlockAlign": frame_bytes,
+        "wBitsPerSample": sample_bytes * 8,
+        "cbSize": 0,  # Non PCM
+        "ckIDFact": b"fact",
+        "cksizeFact": 4,
+        "dwSampleLength": channel_count * frame_count,
+        "ckIDData": b"data",
+        "cksizeData": total_frame_bytes,
+    }
+
+
+def _can_copy_file(arr, wm):
+    return (
+        isinstance(arr, raw.RawMap)
+        and arr.mode != "c"
+        and arr.filename is not None
+        and arr.size
+        and arr._is_frames()
+        and wm._is_frames()
+        and arr.dtype == wm.dtype
+        and arr.shape == wm.shape
+    )
+
+
+def _copy_file(arr, wm):
+    src = os.open(arr.filename, os.O_RDONLY)
+    try:
+        dst = os.open(wm.filename, os.O_RDWR)
+        try:
+            position = arr._file_position()
+            kernel.copy_range(src, position, dst, wm.offset, arr.nbytes)
+        finally:
+            os.close(dst)
+    finally:
+        os.close(src)
+
+
+def _extra_chunks(arr, warn):
+    filename = getattr(arr, "filename", None)
+    if filename is None:
+        raise ValueError("Can only copy chunks from a memory mapped file")
+
+    with open(filename, "rb") as fp:
+        table = read_chunks(fp, warn=warn)
+        parts = []
+        for c in table:
+            if c.tag not in HEADER_TAGS + FILLER_TAGS:
+                fp.seek(c.data)
+                parts.append(chunk_header(c.tag, c.size) + fp.read(c.size))
+                parts.append(b"\0" * (c.size % 2))
+
+    return b"".join(parts)